@@ -0,0 +1,344 @@
+'''
+Offline benchmarks for the scraper's hot paths. Nothing here touches gsmarena.com: end-to-end
+runs crawl a local fixture server that serves makers.php3, brand listings and device pages,
+with configurable latency and error injection. Results are printed (or written) as JSON so
+they can be compared between commits.
+
+    python benchmark.py
+    python benchmark.py --brands 20 --devices 100 --latency 0.05 --error-rate 0.02 --workers 8 -o bench.json
+    python benchmark.py --fixtures saved_pages/   # serve recorded pages instead of generated ones
+'''
+import argparse
+import http.server
+import json
+import math
+import multiprocessing
+import os
+import random
+import resource
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from typing import *
+
+import pandas as pd
+
+import src
+from src import COLUMNS, SPEC_FIELDS, GSMARENAScraper, RecordBuffer, export_typed, normalize_dataset
+
+SAMPLE_RECORD = {"manufacturer": "Yota",
+                 "phonename": "Yota YotaPhone 3",
+                 "releasedate": "2017, September",
+                 "os": "Android 7.1.1, Yota 3",
+                 "batsize": "3200",
+                 "battype": "18W",
+                 "scrsize": "1080x1920",
+                 "scrtype": "AMOLED",
+                 "nettech": "GSM / HSPA / LTE",
+                 "chipset": "Qualcomm MSM8953 Snapdragon 625 (14 nm)",
+                 "cpu": "Octa-core 2.0 GHz Cortex-A53",
+                 "gpu": "Adreno 506",
+                 "internal": "64GB 4GB RAM, 128GB 4GB RAM",
+                 "maincammodule": "12 MP, f/1.9, AF",
+                 "maincamvid": "1080p@30fps",
+                 "selfcammodule": "13 MP, f/2.2",
+                 "selfcamvid": "Na",
+                 "price": "310 EUR"}
+
+def bench_append(sizes:List[int] = [1000, 5000, 10000, 20000, 40000], appends:int = 200) -> dict:
+    '''
+    Measures the cost of appending one row once the dataset already holds n rows,
+    for the old per-row pd.concat and for RecordBuffer.
+
+    PARAMS
+    -----
+    sizes: List[int]
+        Dataset sizes to measure at.
+    appends: int
+        The number of appends timed at each size.
+    '''
+    results = {"concat_us": {}, "buffer_us": {}}
+    for size in sizes:
+        # per-row pd.concat, as getphonespec used to do
+        dataset = pd.DataFrame([SAMPLE_RECORD] * size, columns=COLUMNS)
+        start = time.perf_counter()
+        for _ in range(appends):
+            dataset = pd.concat([dataset, pd.DataFrame({column: [value] for column, value in SAMPLE_RECORD.items()})],
+                                ignore_index=True)
+        results["concat_us"][size] = (time.perf_counter() - start) / appends * 1e6
+
+        buffer = RecordBuffer()
+        for _ in range(size):
+            buffer.append(SAMPLE_RECORD)
+        start = time.perf_counter()
+        for _ in range(appends):
+            buffer.append(SAMPLE_RECORD)
+        results["buffer_us"][size] = (time.perf_counter() - start) / appends * 1e6
+    return results
+
+def synthetic_dataset(rows:int) -> pd.DataFrame:
+    '''
+    Builds a dataset of `rows` phones spread over 100 manufacturers, with varying values.
+    '''
+    records = RecordBuffer()
+    for i in range(rows):
+        records.append({**SAMPLE_RECORD,
+                        "manufacturer": f"Brand{i % 100}",
+                        "phonename": f"Brand{i % 100} Phone {i}",
+                        "batsize": str(2000 + i % 4000),
+                        "releasedate": f"{2000 + i % 25}, September",
+                        "internal": f"{32 * (1 + i % 8)}GB {1 + i % 12}GB RAM, {64 * (1 + i % 8)}GB {2 + i % 12}GB RAM",
+                        "price": f"{100 + i % 1500} EUR"})
+    return records.to_frame()
+
+def bench_export(rows:int = 12000) -> dict:
+    '''
+    Compares file size and load time of the CSV output against the typed Parquet and Feather
+    exports. "csv_typed_load_s" is what downstream jobs pay today: read the CSV, then parse the
+    spec strings into numbers.
+    '''
+    dataset = synthetic_dataset(rows)
+    directory = tempfile.mkdtemp()
+    try:
+        csv_path = os.path.join(directory, "dataset.csv")
+        parquet_path = os.path.join(directory, "dataset.parquet")
+        feather_path = os.path.join(directory, "dataset.feather")
+        dataset.to_csv(csv_path, index=False)
+        export_typed(dataset, parquet_path, "parquet")
+        export_typed(dataset, feather_path, "feather")
+
+        def timed(load):
+            start = time.perf_counter()
+            load()
+            return time.perf_counter() - start
+
+        parquet_bytes = sum(os.path.getsize(os.path.join(folder, name))
+                            for folder, _, names in os.walk(parquet_path) for name in names)
+        return {"rows": rows,
+                "csv_bytes": os.path.getsize(csv_path),
+                "parquet_bytes": parquet_bytes,
+                "feather_bytes": os.path.getsize(feather_path),
+                "csv_load_s": timed(lambda: pd.read_csv(csv_path, dtype=str, keep_default_na=False)),
+                "csv_typed_load_s": timed(lambda: normalize_dataset(pd.read_csv(csv_path, dtype=str, keep_default_na=False))),
+                "parquet_load_s": timed(lambda: pd.read_parquet(parquet_path)),
+                "feather_load_s": timed(lambda: pd.read_feather(feather_path))}
+    finally:
+        shutil.rmtree(directory)
+
+def bench_startup(brands:int = 120) -> dict:
+    '''
+    Measures the time from constructing GSMARENAScraper to having the brand index, on a warm
+    run where the index comes from the brand cache file. No browser or network is involved.
+    '''
+    directory = tempfile.mkdtemp()
+    try:
+        brand_cache = os.path.join(directory, "brands.json")
+        with open(brand_cache, "w", encoding="utf-8") as file:
+            json.dump({"fetched": time.time(),
+                       "brands": [[f"Brand{i}", 100, f"https://www.gsmarena.com/brand{i}-phones-{i}.php"] for i in range(brands)]},
+                      file)
+        start = time.perf_counter()
+        scraper = GSMARENAScraper(brand_cache=brand_cache)
+        constructed = time.perf_counter() - start
+        scraper.brandINFO
+        return {"construct_ms": constructed * 1000, "warm_brand_index_ms": (time.perf_counter() - start) * 1000}
+    finally:
+        shutil.rmtree(directory)
+
+FIXTURE_SECTIONS = {"scrtype": "Display", "chipset": "Platform", "cpu": "Platform", "gpu": "Platform",
+                    "internal": "Memory", "maincammodule": "Main Camera", "maincamvid": "Main Camera",
+                    "selfcammodule": "Selfie camera", "selfcamvid": "Selfie camera", "price": "Misc"}
+
+def build_fixture_site(directory:str, brands:int = 10, devices:int = 60, per_page:int = 40, padding_kb:int = 40):
+    '''
+    Writes a miniature gsmarena.com into `directory`: makers.php3, paginated brand listings and
+    one page per device carrying every SPEC_FIELDS selector. Brand sizes vary from `devices`/2 to
+    `devices`*1.5 so sharding and pagination get exercised. Device pages are padded with markup to
+    roughly the size of real ones, which is what parse time depends on.
+    '''
+    rng = random.Random(0)
+    padding = "".join(f'<li><a href="news-{i}.php">Related article {i}</a></li>' for i in range(padding_kb * 1024 // 48))
+    cells = []
+    for b in range(brands):
+        slug = f"brand{b}"
+        total = rng.randint(devices // 2, devices * 3 // 2)
+        cells.append(f'<td><a href="{slug}-phones-{b}.php">Brand{b}<br><span>{total} devices</span></a></td>')
+        pages = max(1, math.ceil(total / per_page))
+        for p in range(1, pages + 1):
+            items = "".join(f'<li><a href="{slug}_phone_{d}-{b}{d}.php"><strong><span>Phone {d}</span></strong></a></li>'
+                            for d in range((p - 1) * per_page, min(p * per_page, total)))
+            nav = ""
+            if pages > 1:
+                links = " ".join(f"<strong>{k}</strong>" if k == p else f'<a href="{slug}-phones-f-{b}-0-p{k}.php">{k}</a>'
+                                 for k in range(1, pages + 1))
+                nav = (f'<div class="review-nav-v2"><div class="nav-pages">{links} '
+                       f'<a class="prevnextbutton" href="{slug}-phones-f-{b}-0-p{min(p + 1, pages)}.php">&#9658;</a></div></div>')
+            name = f"{slug}-phones-{b}.php" if p == 1 else f"{slug}-phones-f-{b}-0-p{p}.php"
+            with open(os.path.join(directory, name), "w", encoding="utf-8") as file:
+                file.write(f'<html><body><div class="article-info"><h1 class="article-info-name">Brand{b} phones</h1></div>'
+                           f'{nav}<div id="review-body"><div class="makers"><ul>{items}</ul></div></div></body></html>')
+        for d in range(total):
+            values = {column: f"{column} value {rng.randint(0, 999)}" for column, *_ in SPEC_FIELDS}
+            values.update({"phonename": f"Brand{b} Phone {d}", "releasedate": f"Released {rng.randint(2000, 2025)}, May",
+                           "batsize": str(rng.randint(1000, 7000)), "scrsize": "1080x2400 pixels",
+                           "price": f"About {rng.randint(50, 1500)} EUR"})
+            # td fields sit in the specs table like on the real site, next to rows the dataset does not keep
+            specs = "".join(f'<{tag} {attribute}="{value}">{values[column]}</{tag}>'
+                            for column, tag, attribute, value, _ in SPEC_FIELDS if tag != "td")
+            sections = {"Body": [("Weight", f"{rng.randint(120, 250)} g"), ("Build", "Glass front, aluminum frame"),
+                                 ("", "IP68 dust/water resistant")]}
+            for column, tag, attribute, value, _ in SPEC_FIELDS:
+                if tag == "td":
+                    sections.setdefault(FIXTURE_SECTIONS[column], []).append(
+                        (column, f'<td class="nfo" {attribute}="{value}">{values[column]}</td>'))
+            for section, rows in sections.items():
+                table = "".join(f'<tr>{f"<th>{section}</th>" if number == 0 else ""}<td class="ttl">{key or "&nbsp;"}</td>'
+                                f'{value if value.startswith("<td") else f"<td class=nfo>{value}</td>"}</tr>'
+                                for number, (key, value) in enumerate(rows))
+                specs += f'<table>{table}</table>'
+            specs = f'<div id="specs-list">{specs}</div>'
+            with open(os.path.join(directory, f"{slug}_phone_{d}-{b}{d}.php"), "w", encoding="utf-8") as file:
+                file.write(f'<html><body><ul class="nav">{padding}</ul><div id="body"><div class="main">{specs}</div></div>'
+                           f'</body></html>')
+    with open(os.path.join(directory, "makers.php3"), "w", encoding="utf-8") as file:
+        file.write(f'<html><body><div class="st-text"><table><tr>{"".join(cells)}</tr></table></div></body></html>')
+
+def serve_fixtures(directory:str, port:int, latency:float, error_rate:float, throttle_rate:float):
+    '''
+    Serves a fixture directory, run in its own process so its CPU time stays out of the numbers.
+    Every response is delayed by `latency` seconds, `error_rate` of them are 503s and
+    `throttle_rate` of them are 429s with Retry-After: 1.
+    '''
+    rng = random.Random(1)
+    lock = threading.Lock()
+
+    class Handler(http.server.SimpleHTTPRequestHandler):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, directory=directory, **kwargs)
+
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            time.sleep(latency)
+            with lock:
+                roll = rng.random()
+            if self.path == "/robots.txt":
+                self.send_response(404)
+                self.end_headers()
+            elif roll < error_rate:
+                self.send_response(503)
+                self.end_headers()
+            elif roll < error_rate + throttle_rate:
+                self.send_response(429)
+                self.send_header("Retry-After", "1")
+                self.end_headers()
+            else:
+                super().do_GET()
+
+    http.server.ThreadingHTTPServer(("127.0.0.1", port), Handler).serve_forever()
+
+class FixtureServer:
+    def __init__(self, directory:str, latency:float = 0.0, error_rate:float = 0.0, throttle_rate:float = 0.0):
+        '''
+        Local stand-in for gsmarena.com. Use as a context manager, it points src.MAKERS_URL at itself.
+        '''
+        self.port = random.randint(20000, 60000)
+        self.process = multiprocessing.Process(target=serve_fixtures, daemon=True,
+                                               args=(directory, self.port, latency, error_rate, throttle_rate))
+
+    def __enter__(self):
+        self.process.start()
+        time.sleep(0.5)
+        src.MAKERS_URL = f"http://127.0.0.1:{self.port}/makers.php3"
+        return self
+
+    def __exit__(self, *args):
+        self.process.terminate()
+        self.process.join()
+
+def run_scenario(scenario:str, makers_url:str, workers:int, results:multiprocessing.Queue):
+    # runs in a fresh process, so peak RSS belongs to this scenario alone
+    os.chdir(tempfile.mkdtemp())
+    src.MAKERS_URL = makers_url
+    # progress prints would end up in the JSON on stdout
+    sys.stdout = open(os.devnull, "w")
+    wall, cpu = time.perf_counter(), time.process_time()
+    scraper = GSMARENAScraper(RATE_LIMIT=0, workers=workers, brand_cache=None, max_retries=5)
+    if scenario == "brand_scrape":
+        scraper.brand_scrape(scraper.brandINFO.sort_values("total_devices")["manufacturer"].iloc[-1])
+    else:
+        scraper.scrapeALL()
+    wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+    build = time.perf_counter()
+    scraper.dataset
+    build = time.perf_counter() - build
+    devices = len(scraper.records)
+    results.put({"devices": devices,
+                 "wall_s": wall,
+                 "devices_per_s": devices / wall if wall else 0.0,
+                 "cpu_ms_per_device": cpu / devices * 1000 if devices else 0.0,
+                 "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+                 "dataset_build_ms": build * 1000,
+                 "retries": scraper.metrics.counters["retries"],
+                 "fetch_errors": scraper.metrics.counters["fetch_errors"]})
+
+def bench_crawl(fixtures:Optional[str] = None, brands:int = 10, devices:int = 60, latency:float = 0.0,
+                error_rate:float = 0.0, throttle_rate:float = 0.0, workers:int = 4) -> dict:
+    '''
+    End-to-end brand_scrape (largest brand) and scrapeALL against the local fixture server.
+
+    PARAMS
+    -----
+    fixtures: str
+        Directory of recorded pages to serve. Generated with build_fixture_site when not given.
+    brands, devices:
+        Size of the generated site: number of brands and average devices per brand.
+    latency, error_rate, throttle_rate:
+        Server behaviour, see serve_fixtures.
+    workers: int
+        Concurrent device fetches.
+    '''
+    directory = fixtures or tempfile.mkdtemp()
+    try:
+        if fixtures is None:
+            build_fixture_site(directory, brands, devices)
+        results = {}
+        with FixtureServer(directory, latency, error_rate, throttle_rate):
+            for scenario in ("brand_scrape", "scrapeALL"):
+                queue = multiprocessing.Queue()
+                process = multiprocessing.Process(target=run_scenario, args=(scenario, src.MAKERS_URL, workers, queue))
+                process.start()
+                results[scenario] = queue.get()
+                process.join()
+        return {"config": {"fixtures": fixtures, "brands": brands, "devices": devices, "latency": latency,
+                           "error_rate": error_rate, "throttle_rate": throttle_rate, "workers": workers},
+                **results}
+    finally:
+        if fixtures is None:
+            shutil.rmtree(directory)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="offline scraper benchmarks")
+    parser.add_argument("--fixtures", help="directory of recorded pages to serve instead of generated ones")
+    parser.add_argument("--brands", type=int, default=10)
+    parser.add_argument("--devices", type=int, default=60, help="average devices per generated brand")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of 503 responses")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="fraction of 429 responses")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("-o", "--output", help="write the JSON here as well")
+    args = parser.parse_args()
+
+    report = {"time": time.time(),
+              "crawl": bench_crawl(args.fixtures, args.brands, args.devices, args.latency, args.error_rate,
+                                   args.throttle_rate, args.workers),
+              "append": bench_append(),
+              "export": bench_export(),
+              "startup": bench_startup()}
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
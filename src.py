@@ -1,6 +1,9 @@
 from selenium import webdriver
-from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.options import Options
+from selenium.common.exceptions import WebDriverException
+import requests
+from requests.adapters import HTTPAdapter
+from lxml import etree, html
 
 import re
 import pandas as pd
@@ -9,230 +12,1612 @@ from typing import *
 from tqdm import tqdm
 import os
 import datetime
-import tkinter as tk
-from tkinter import ttk, messagebox
+import hashlib
+import json
+import csv
+import gzip
+import sqlite3
 import threading
+import fcntl
+import sys
+import multiprocessing
+import tarfile
+import shutil
+import zipfile
+import argparse
+import abc
+import email.utils
+from urllib.parse import urljoin
+from urllib.robotparser import RobotFileParser
+from concurrent.futures import ThreadPoolExecutor
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.3"
+MAKERS_URL = "https://www.gsmarena.com/makers.php3"
+
+# compiled XPaths shared by every backend (browsers insert <tbody>, raw HTML may not have it)
+BRAND_LINKS = etree.XPath('.//div[@class="st-text"]//td/descendant::a[1]')
+DEVICE_ITEMS = etree.XPath('.//div[@id="review-body"]/div[@class="makers"]/ul/li')
+PAGE_NAV = etree.XPath('.//div[@class="review-nav-v2"]//div[@class="nav-pages"]')
+BRAND_TITLE = etree.XPath('.//h1["@class = article-info-name"]')
+SPEC_BOX = etree.XPath('.//div[@id="body"]/div[1]')
+SPEC_TABLES = etree.XPath('.//div[@id="specs-list"]/table')
+SPEC_ROWS = etree.XPath('.//tr[td[@class="nfo"]]')
+SPEC_SECTION = etree.XPath('string(.//th[1])')
+
+# spec fields pulled from a device page
+# column, tag, attribute, value, post-processing
+SPEC_FIELDS = [
+    ("phonename", "h1", "class", "specs-phone-name-title", None),
+    ("releasedate", "span", "data-spec", "released-hl", lambda text: text.removeprefix("Released ")),
+    ("os", "span", "data-spec", "os-hl", None),
+    # battery
+    ("batsize", "span", "data-spec", "batsize-hl", None),
+    ("battype", "div", "data-spec", "battype-hl", None),
+    # screen
+    ("scrsize", "div", "data-spec", "displayres-hl", lambda text: text.strip(" pixels")),
+    ("scrtype", "td", "data-spec", "displaytype", None),
+    ("nettech", "a", "data-spec", "nettech", None),
+    # platform
+    ("chipset", "td", "data-spec", "chipset", None),
+    ("cpu", "td", "data-spec", "cpu", None),
+    ("gpu", "td", "data-spec", "gpu", None),
+    ("internal", "td", "data-spec", "internalmemory", None),
+    # main camera
+    ("maincammodule", "td", "data-spec", "cam1modules", None),
+    ("maincamvid", "td", "data-spec", "cam1video", None),
+    # selfie camera
+    ("selfcammodule", "td", "data-spec", "cam2modules", None),
+    ("selfcamvid", "td", "data-spec", "cam2video", None),
+    # price
+    ("price", "td", "data-spec", "price", lambda text: text.strip("About ")),
+]
+SPEC_LOOKUP = {(tag, attribute, value): column for column, tag, attribute, value, _ in SPEC_FIELDS}
+COLUMNS = ["manufacturer"] + [field[0] for field in SPEC_FIELDS]
+SEARCH_COLUMNS = ["phonename", "chipset", "cpu", "gpu"]
+
+def element_text(element) -> str:
+    '''
+    Returns the visible text of an lxml element the way WebDriver's .text does:
+    <br> becomes a newline and runs of whitespace collapse to a single space.
+    '''
+    parts = []
+    def walk(node):
+        if not isinstance(node.tag, str):  # comments, processing instructions
+            return
+        if node.tag == "br":
+            parts.append("\n")
+        if node.text:
+            parts.append(node.text)
+        for child in node:
+            walk(child)
+            if child.tail:
+                parts.append(child.tail)
+    walk(element)
+    lines = (" ".join(line.split()) for line in "".join(parts).split("\n"))
+    return "\n".join(line for line in lines if line)
+
+def extract_spec(spec_box) -> dict:
+    '''
+    Resolves every SPEC_FIELDS entry in a single walk over the phone specifications box.
+    The first matching element wins, fields that are not on the page are "Na".
+    '''
+    found = {}
+    for element in spec_box.iter(etree.Element):
+        for attribute in ("data-spec", "class"):
+            column = SPEC_LOOKUP.get((element.tag, attribute, element.get(attribute)))
+            if column is not None and column not in found:
+                found[column] = element
+    record = {}
+    for column, _, _, _, postprocess in SPEC_FIELDS:
+        if column not in found:
+            record[column] = "Na"
+            continue
+        text = element_text(found[column])
+        record[column] = postprocess(text) if postprocess else text
+    return record
+
+def extract_spec_sheet(spec_box) -> List[Tuple[str, str, str]]:
+    '''
+    Every row of the specs table as (section, key, value), e.g. ("Platform", "Chipset", "...").
+    Rows without a key continue the row above and are joined to its value with a newline.
+    '''
+    sheet = []
+    for table in SPEC_TABLES(spec_box):
+        section = " ".join(SPEC_SECTION(table).split())
+        for row in SPEC_ROWS(table):
+            key = " ".join(row.xpath('string(./td[@class="ttl"])').split())
+            value = element_text(row.xpath('./td[@class="nfo"]')[0])
+            if not key and sheet and sheet[-1][0] == section:
+                sheet[-1] = (section, sheet[-1][1], f"{sheet[-1][2]}\n{value}".strip())
+            else:
+                sheet.append((section, key, value))
+    return sheet
+
+class RecordBuffer:
+    __slots__ = ("columns", "_data")
+
+    def __init__(self, columns:List[str] = COLUMNS):
+        '''
+        Append-only columnar store for scraped rows. Appending is O(1) no matter how
+        many rows are already held, the DataFrame is only built when asked for.
+
+        PARAMS
+        -----
+        columns: List[str]
+            The column names, in output order.
+        '''
+        self.columns = list(columns)
+        self._data = {column: [] for column in self.columns}
+
+    def append(self, record:dict):
+        '''
+        Adds one row. Columns missing from the record are filled with "Na".
+        '''
+        for column in self.columns:
+            self._data[column].append(record.get(column, "Na"))
+
+    def __len__(self) -> int:
+        return len(self._data[self.columns[0]])
+
+    def truncate(self, size:int):
+        '''
+        Drops every row from row `size` on.
+        '''
+        for values in self._data.values():
+            del values[size:]
+
+    def to_frame(self, start:int = 0) -> pd.DataFrame:
+        '''
+        Materializes the buffered rows, from row `start` on, into a DataFrame.
+        '''
+        return pd.DataFrame({column: values[start:] for column, values in self._data.items()}, columns=self.columns)
+
+def record_hash(record:dict) -> str:
+    '''
+    Returns a short content hash of a scraped row, used to tell whether a device changed.
+    '''
+    payload = "\x1f".join(str(record.get(column, "Na")) for column in COLUMNS)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+class DeviceIndex:
+    def __init__(self, path:str = "OUTPUT/.device-index.json"):
+        '''
+        Persistent index of every device URL scraped so far, with the brand it belongs to,
+        its phone name, when it was fetched and a hash of its row. Also remembers each
+        brand's device count from makers.php3 at the time of its last crawl.
+
+        PARAMS
+        -----
+        path: str
+            The JSON file the index is kept in.
+        '''
+        self.path = path
+        self.devices, self.brands = self.read()
+        self.changed = set()
+        self.removed = set()
+        self.changed_brands = set()
+
+    def read(self) -> Tuple[dict, dict]:
+        if not os.path.exists(self.path):
+            return {}, {}
+        with open(self.path, encoding="utf-8") as file:
+            stored = json.load(file)
+        return stored.get("devices", {}), stored.get("brands", {})
+
+    def add(self, url:str, brand:str, record:dict, fingerprint:Optional[str] = None):
+        self.changed.add(url)
+        self.removed.discard(url)
+        self.devices[url] = {"brand": brand,
+                             "phonename": record.get("phonename", "Na"),
+                             "fetched": time.time(),
+                             "hash": fingerprint or record_hash(record)}
+
+    def set_brand(self, brand:str, total_devices:int):
+        self.changed_brands.add(brand)
+        self.brands[brand] = total_devices
+
+    def forget(self, url:str):
+        '''
+        Drops a device that is no longer listed on the site.
+        '''
+        self.devices.pop(url, None)
+        self.changed.discard(url)
+        self.removed.add(url)
+
+    def is_fresh(self, url:str, ttl:float) -> bool:
+        '''
+        Whether the URL was fetched less than `ttl` seconds ago.
+        '''
+        entry = self.devices.get(url)
+        return entry is not None and time.time() - entry["fetched"] < ttl
+
+    def brand_unchanged(self, brand:str, total_devices:int, ttl:float) -> bool:
+        '''
+        Whether the brand's device count matches the last crawl and none of its devices
+        have gone stale, i.e. the brand can be skipped entirely.
+        '''
+        if self.brands.get(brand) != total_devices:
+            return False
+        entries = [entry for entry in self.devices.values() if entry["brand"] == brand]
+        return bool(entries) and all(time.time() - entry["fetched"] < ttl for entry in entries)
+
+    def phonenames(self, brand:str) -> set:
+        return {entry["phonename"] for entry in self.devices.values() if entry["brand"] == brand}
+
+    def save(self):
+        '''
+        Writes the index atomically, a crash mid-write leaves the previous version intact.
+        Entries saved meanwhile by other processes (sharded crawls) are merged in, not overwritten:
+        the read-merge-replace holds an exclusive lock on <path>.lock.
+        '''
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(f"{self.path}.lock", "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            devices, brands = self.read()
+            devices.update({url: self.devices[url] for url in self.changed})
+            for url in self.removed:
+                devices.pop(url, None)
+            brands.update({brand: self.brands[brand] for brand in self.changed_brands})
+            self.devices, self.brands = devices, brands
+            self.changed = set()
+            self.removed = set()
+            self.changed_brands = set()
+            temp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as file:
+                json.dump({"devices": self.devices, "brands": self.brands}, file)
+            os.replace(temp_path, self.path)
+
+class ChangeLog:
+    def __init__(self, path:str):
+        '''
+        Append-only JSONL log of what a crawl changed compared to the previous one, one line per device:
+
+            {"change": "added", "brand", "url", "phonename", "record"}
+            {"change": "changed", "brand", "url", "phonename", "fields": {column: [old, new]}}
+            {"change": "removed", "brand", "url", "phonename"}
+
+        "fields" is null when the previous row is no longer on disk to compare against.
+
+        PARAMS
+        -----
+        path: str
+            The log file. Appended to, several shard processes may share it.
+        '''
+        self.path = path
+        self.counts = {"added": 0, "changed": 0, "removed": 0}
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.file = open(path, "a", encoding="utf-8")
+
+    def write(self, change:str, brand:str, url:str, phonename:str, **data):
+        self.counts[change] += 1
+        self.file.write(json.dumps({"change": change, "time": time.time(), "brand": brand, "url": url,
+                                    "phonename": phonename, **data}) + "\n")
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+        print(f"{self.counts['added']} added, {self.counts['changed']} changed and {self.counts['removed']} removed devices logged to {self.path}")
+
+class CheckpointJournal:
+    def __init__(self, path:str, fsync_interval:int = 20):
+        '''
+        Append-only JSONL journal of crawl progress. Each completed device, listing page and
+        brand is written as one line as soon as it is done, so a write costs O(new rows).
+
+        PARAMS
+        -----
+        path: str
+            The journal file. Appended to if it already exists.
+        fsync_interval: int
+            fsync the journal every this many devices. 1 survives power loss on every row,
+            0 leaves flushing to the OS.
+        '''
+        self.path = path
+        self.fsync_interval = fsync_interval
+        self.pending = 0
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.file = open(path, "a", encoding="utf-8")
+
+    def write(self, event:dict):
+        self.file.write(json.dumps(event) + "\n")
+        self.file.flush()
+        if event["type"] == "device":
+            self.pending += 1
+        if self.fsync_interval and self.pending >= self.fsync_interval:
+            os.fsync(self.file.fileno())
+            self.pending = 0
+
+    def close(self):
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.file.close()
+
+    @staticmethod
+    def read(path:str) -> Iterator[dict]:
+        '''
+        Yields the journal's events in order. A line cut short by a crash ends the journal.
+        '''
+        with open(path, encoding="utf-8") as file:
+            for line in file:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    return
+
+class CrawlMetrics:
+    def __init__(self, directory:Optional[str] = None, interval:float = 60):
+        '''
+        Thread-safe crawl instrumentation: timings per stage (fetch, parse, extract, rate
+        limiter wait), counters (pages, cache hits, errors, retries, devices) and per-field
+        miss counts. Reports are written every `interval` seconds as one JSON line to
+        <directory>/metrics.jsonl and as Prometheus text exposition to <directory>/metrics.prom.
+
+        PARAMS
+        -----
+        directory: str
+            Where reports are written. None only collects, see snapshot().
+        interval: float
+            Seconds between reports.
+        '''
+        self.directory = directory
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.started = time.monotonic()
+        self.last_report = self.started
+        self.counters = {"pages": 0, "cache_hits": 0, "fetch_errors": 0, "retries": 0, "devices": 0}
+        self.timings = {stage: [0, 0.0, 0.0] for stage in ("fetch", "parse", "extract", "limiter_wait")}  # count, sum, max
+        self.field_misses = {field[0]: 0 for field in SPEC_FIELDS}
+        self.warned = set()
+
+    def inc(self, counter:str, amount:int = 1):
+        with self.lock:
+            self.counters[counter] += amount
+
+    def observe(self, stage:str, seconds:float):
+        with self.lock:
+            timing = self.timings[stage]
+            timing[0] += 1
+            timing[1] += seconds
+            timing[2] = max(timing[2], seconds)
+
+    def record_fields(self, record:dict):
+        '''
+        Counts a scraped device and which of its spec fields came out "Na".
+        '''
+        with self.lock:
+            self.counters["devices"] += 1
+            for field in self.field_misses:
+                if record.get(field, "Na") == "Na":
+                    self.field_misses[field] += 1
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            elapsed = time.monotonic() - self.started
+            devices = self.counters["devices"]
+            return {"time": time.time(),
+                    "elapsed_s": elapsed,
+                    **self.counters,
+                    "pages_per_s": self.counters["pages"] / elapsed if elapsed else 0.0,
+                    "timings": {stage: {"count": count, "sum_s": total, "mean_s": total / count if count else 0.0, "max_s": peak}
+                                for stage, (count, total, peak) in self.timings.items()},
+                    "field_miss_rate": {field: misses / devices if devices else 0.0
+                                        for field, misses in self.field_misses.items()}}
+
+    def to_prometheus(self, snapshot:Optional[dict] = None) -> str:
+        snapshot = snapshot or self.snapshot()
+        lines = []
+        for counter in self.counters:
+            lines += [f"# TYPE gsmarena_{counter}_total counter", f"gsmarena_{counter}_total {snapshot[counter]}"]
+        lines += ["# TYPE gsmarena_pages_per_second gauge", f"gsmarena_pages_per_second {snapshot['pages_per_s']}"]
+        lines += ["# TYPE gsmarena_stage_seconds summary"]
+        for stage, timing in snapshot["timings"].items():
+            lines += [f'gsmarena_stage_seconds_count{{stage="{stage}"}} {timing["count"]}',
+                      f'gsmarena_stage_seconds_sum{{stage="{stage}"}} {timing["sum_s"]}']
+        lines += ["# TYPE gsmarena_field_miss_ratio gauge"]
+        for field, rate in snapshot["field_miss_rate"].items():
+            lines.append(f'gsmarena_field_miss_ratio{{field="{field}"}} {rate}')
+        return "\n".join(lines) + "\n"
+
+    def report(self, force:bool = False):
+        '''
+        Writes a report if `interval` seconds passed since the last one (or if forced). Warns once
+        about every field missing on all devices so far, the usual sign of a site layout change.
+        '''
+        now = time.monotonic()
+        if not force and now - self.last_report < self.interval:
+            return
+        self.last_report = now
+        snapshot = self.snapshot()
+        if snapshot["devices"] >= 20:
+            for field, rate in snapshot["field_miss_rate"].items():
+                if rate == 1.0 and field not in self.warned:
+                    self.warned.add(field)
+                    print(f"WARNING: field {field} is Na on all {snapshot['devices']} devices so far, check its selector")
+        if self.directory is None:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        with open(os.path.join(self.directory, "metrics.jsonl"), "a", encoding="utf-8") as file:
+            file.write(json.dumps(snapshot) + "\n")
+        prom_path = os.path.join(self.directory, "metrics.prom")
+        with open(f"{prom_path}.tmp", "w", encoding="utf-8") as file:
+            file.write(self.to_prometheus(snapshot))
+        os.replace(f"{prom_path}.tmp", prom_path)
+
+def open_parquet(path:str, schema, append:bool = False):
+    '''
+    Opens a zstd ParquetWriter that writes to <path>.tmp, see close_parquet. Parquet files cannot
+    be appended to in place, so with append the existing file is copied over row group by row
+    group first. Needs pyarrow.
+    '''
+    import pyarrow.parquet
+    writer = pyarrow.parquet.ParquetWriter(f"{path}.tmp", schema, compression="zstd")
+    if append and os.path.exists(path):
+        existing = pyarrow.parquet.ParquetFile(path)
+        for group in range(existing.num_row_groups):
+            writer.write_table(existing.read_row_group(group).cast(schema))
+    return writer
+
+def close_parquet(path:str, writer):
+    # the finished file replaces the old one, a crash before this leaves the old file intact
+    writer.close()
+    os.replace(f"{path}.tmp", path)
+
+class RowSink(abc.ABC):
+    def __init__(self, path:str, batch_size:int = 100, columns:List[str] = COLUMNS, append:bool = False):
+        '''
+        Receives scraped rows as they are produced and writes them out in batches, so a crawl
+        does not have to hold its rows until the end. Subclasses implement write_batch.
+
+        PARAMS
+        -----
+        path: str
+            The output file.
+        batch_size: int
+            Rows held before they are written out. Every brand end flushes as well.
+        columns: List[str]
+            The columns written, in order.
+        append: bool
+            Keep the rows already in the file, e.g. when resuming a crawl. Otherwise the file
+            starts out empty.
+        '''
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        self.path = path
+        self.batch_size = batch_size
+        self.columns = list(columns)
+        self.append = append
+        self.batch = []
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    def write(self, url:Optional[str], record:dict):
+        self.batch.append([str(record.get(column, "Na")) for column in self.columns])
+        if len(self.batch) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self.batch:
+            self.write_batch(self.batch)
+            self.batch = []
+
+    @abc.abstractmethod
+    def write_batch(self, rows:List[list]):
+        '''
+        Writes one batch of rows, each a list of strings in `columns` order.
+        '''
+
+    def close(self):
+        self.flush()
+
+class CSVSink(RowSink):
+    def __init__(self, path:str, batch_size:int = 100, columns:List[str] = COLUMNS, append:bool = False):
+        super().__init__(path, batch_size, columns, append)
+        header = not append or not os.path.exists(path) or os.path.getsize(path) == 0
+        self.file = open(path, "a" if append else "w", encoding="utf-8", newline="")
+        self.writer = csv.writer(self.file, lineterminator="\n")
+        if header:
+            self.writer.writerow(self.columns)
+
+    def write_batch(self, rows:List[list]):
+        self.writer.writerows(rows)
+        self.file.flush()
+
+    def close(self):
+        super().close()
+        self.file.close()
+
+class JSONLSink(RowSink):
+    def __init__(self, path:str, batch_size:int = 100, columns:List[str] = COLUMNS, append:bool = False):
+        super().__init__(path, batch_size, columns, append)
+        self.file = open(path, "a" if append else "w", encoding="utf-8")
+
+    def write_batch(self, rows:List[list]):
+        self.file.write("".join(json.dumps(dict(zip(self.columns, row))) + "\n" for row in rows))
+        self.file.flush()
+
+    def close(self):
+        super().close()
+        self.file.close()
+
+class SQLiteSink(RowSink):
+    def __init__(self, path:str, batch_size:int = 100, columns:List[str] = COLUMNS, append:bool = False,
+                 table:str = "devices"):
+        '''
+        Inserts rows into a table with one TEXT column per dataset column, one transaction per batch.
+        Without append the table is emptied first, other tables in the file are left alone.
+        '''
+        super().__init__(path, batch_size, columns, append)
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute(f"CREATE TABLE IF NOT EXISTS {table} ({', '.join(f'{column} TEXT' for column in self.columns)})")
+        if not append:
+            with self.db:
+                self.db.execute(f"DELETE FROM {table}")
+        self.insert = f"INSERT INTO {table} VALUES ({', '.join('?' * len(self.columns))})"
+
+    def write_batch(self, rows:List[list]):
+        with self.db:
+            self.db.executemany(self.insert, rows)
+
+    def close(self):
+        super().close()
+        self.db.close()
+
+class ParquetSink(RowSink):
+    def __init__(self, path:str, batch_size:int = 1000, columns:List[str] = COLUMNS, append:bool = False):
+        '''
+        Writes each batch as one row group of a single Parquet file, all columns as strings.
+        The file is complete once the sink is closed, see open_parquet. Needs pyarrow.
+        '''
+        import pyarrow
+        super().__init__(path, batch_size, columns, append)
+        self.pyarrow = pyarrow
+        self.schema = pyarrow.schema([(column, pyarrow.string()) for column in self.columns])
+        self.writer = open_parquet(path, self.schema, append)
+
+    def write_batch(self, rows:List[list]):
+        columns = [self.pyarrow.array(values, self.pyarrow.string()) for values in zip(*rows)]
+        self.writer.write_table(self.pyarrow.Table.from_arrays(columns, schema=self.schema))
+
+    def close(self):
+        super().close()
+        close_parquet(self.path, self.writer)
+
+class SpecStore(RowSink):
+    def __init__(self, path:str = "OUTPUT/gsmarena.db", batch_size:int = 50, columns:List[str] = COLUMNS):
+        '''
+        Queryable SQLite store of scraped devices, one row per device URL. Used as a sink, rows
+        are upserted as they are scraped so a recrawl updates devices in place. Manufacturer,
+        release date and chipset are indexed and phonename/chipset/cpu/gpu are full-text
+        searchable (FTS5), so lookups never load the whole dataset, see query.
+
+        PARAMS
+        -----
+        path: str
+            The database file. Created if missing.
+        batch_size: int
+            Rows per upsert transaction.
+        '''
+        super().__init__(path, batch_size, columns, append=True)  # rows are upserted, never truncated
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("PRAGMA journal_mode=WAL")
+        fields = ", ".join(f"{column} TEXT" for column in self.columns)
+        searchable = ", ".join(SEARCH_COLUMNS)
+        self.db.executescript(f'''
+            CREATE TABLE IF NOT EXISTS devices (id INTEGER PRIMARY KEY, url TEXT UNIQUE NOT NULL, {fields},
+                                                released TEXT, updated REAL);
+            CREATE INDEX IF NOT EXISTS devices_manufacturer ON devices (manufacturer);
+            CREATE INDEX IF NOT EXISTS devices_released ON devices (released);
+            CREATE INDEX IF NOT EXISTS devices_chipset ON devices (chipset COLLATE NOCASE);
+            CREATE VIRTUAL TABLE IF NOT EXISTS devices_fts USING fts5({searchable}, content='devices', content_rowid='id');
+            CREATE TRIGGER IF NOT EXISTS devices_ai AFTER INSERT ON devices BEGIN
+                INSERT INTO devices_fts (rowid, {searchable}) VALUES (new.id, {", ".join(f"new.{c}" for c in SEARCH_COLUMNS)});
+            END;
+            CREATE TRIGGER IF NOT EXISTS devices_ad AFTER DELETE ON devices BEGIN
+                INSERT INTO devices_fts (devices_fts, rowid, {searchable}) VALUES ('delete', old.id, {", ".join(f"old.{c}" for c in SEARCH_COLUMNS)});
+            END;
+            CREATE TRIGGER IF NOT EXISTS devices_au AFTER UPDATE ON devices BEGIN
+                INSERT INTO devices_fts (devices_fts, rowid, {searchable}) VALUES ('delete', old.id, {", ".join(f"old.{c}" for c in SEARCH_COLUMNS)});
+                INSERT INTO devices_fts (rowid, {searchable}) VALUES (new.id, {", ".join(f"new.{c}" for c in SEARCH_COLUMNS)});
+            END;
+        ''')
+        names = ["url"] + self.columns + ["released", "updated"]
+        updates = ", ".join(f"{name} = excluded.{name}" for name in names[1:])
+        self.upsert = (f"INSERT INTO devices ({', '.join(names)}) VALUES ({', '.join('?' * len(names))}) "
+                       f"ON CONFLICT(url) DO UPDATE SET {updates}")
+
+    def write(self, url:Optional[str], record:dict):
+        # rows incremental mode reused without fetching come without a url, they are stored already
+        if url is None:
+            return
+        row = [str(record.get(column, "Na")) for column in self.columns]
+        self.batch.append([url] + row + [release_month(record.get("releasedate", "")), time.time()])
+        if len(self.batch) >= self.batch_size:
+            self.flush()
+
+    def write_batch(self, rows:List[list]):
+        with self.db:
+            self.db.executemany(self.upsert, rows)
+
+    def query(self, text:Optional[str] = None, manufacturer:Optional[str] = None, chipset:Optional[str] = None,
+              released_from:Optional[str] = None, released_to:Optional[str] = None, limit:int = 50,
+              raw:bool = False) -> List[dict]:
+        '''
+        Looks devices up, newest release first. Every given filter must match.
+
+        PARAMS
+        -----
+        text: str
+            Full-text search over phonename, chipset, cpu and gpu. Every word has to match,
+            punctuation is taken literally: "Galaxy S24+", "SM8550-AC".
+        manufacturer: str
+            Exact brand name.
+        chipset: str
+            Chipset name, case-insensitive, % wildcards allowed.
+        released_from, released_to: str
+            Inclusive release range as "YYYY" or "YYYY-MM".
+        limit: int
+            The most rows returned.
+        raw: bool
+            Pass `text` to FTS5 as is, for its query syntax, e.g. "phonename:galaxy* OR cpu:cortex".
+            Malformed queries raise sqlite3.OperationalError.
+        '''
+        self.flush()
+        if text and not raw:
+            text = " ".join('"' + word.replace('"', '""') + '"' for word in text.split())
+        conditions, params = [], []
+        if text:
+            conditions.append("id IN (SELECT rowid FROM devices_fts WHERE devices_fts MATCH ?)")
+            params.append(text)
+        if manufacturer:
+            conditions.append("manufacturer = ?")
+            params.append(manufacturer)
+        if chipset:
+            conditions.append("chipset LIKE ?")
+            params.append(chipset)
+        if released_from:
+            conditions.append("released >= ?")
+            params.append(released_from)
+        if released_to:
+            # "2023" has to include "2023-12"
+            conditions.append("released <= ?")
+            params.append(released_to + ("-99" if len(released_to) == 4 else ""))
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        rows = self.db.execute(f"SELECT * FROM devices {where} ORDER BY released DESC, id LIMIT ?", params + [limit])
+        return [dict(row) for row in rows]
+
+    def get(self, url:str) -> Optional[dict]:
+        self.flush()
+        row = self.db.execute("SELECT * FROM devices WHERE url = ?", (url,)).fetchone()
+        return dict(row) if row else None
+
+    def __len__(self) -> int:
+        self.flush()
+        return self.db.execute("SELECT COUNT(*) FROM devices").fetchone()[0]
+
+    def close(self):
+        super().close()
+        self.db.close()
+
+class SpecSheetWriter:
+    def __init__(self, path:str = "OUTPUT/GSMARENA-SPECSHEETS.parquet", batch_size:int = 200, append:bool = False):
+        '''
+        Stores full spec sheets (see extract_spec_sheet) in long format, one row per
+        (url, phonename, section, key, value, fetched). ".parquet" writes dictionary-encoded, zstd
+        compressed row groups of batch_size devices (needs pyarrow, complete once closed);
+        ".jsonl.gz" writes one nested {"url", "phonename", "fetched", "specs": {section: {key: value}}}
+        object per device. Read either back with read_spec_sheets.
+
+        Like the row sinks, both formats start out empty unless `append` is set, which keeps
+        the sheets already stored: use it when resuming, and for incremental crawls, which
+        do not fetch fresh devices again. Of a device captured twice only the latest capture is read back.
+        '''
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        self.path = path
+        self.batch_size = batch_size
+        self.batch = []
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        if path.endswith(".parquet"):
+            import pyarrow
+            self.pyarrow = pyarrow
+            keys = pyarrow.dictionary(pyarrow.int32(), pyarrow.string())
+            self.schema = pyarrow.schema([("url", keys), ("phonename", keys), ("section", keys), ("key", keys),
+                                          ("value", pyarrow.string()), ("fetched", pyarrow.float64())])
+            self.writer = open_parquet(path, self.schema, append)
+        elif path.endswith(".jsonl.gz"):
+            self.file = gzip.open(path, "at" if append else "wt", encoding="utf-8")
+        else:
+            raise ValueError("spec sheets are written to .parquet or .jsonl.gz")
+
+    def write(self, url:str, phonename:str, sheet:List[Tuple[str, str, str]]):
+        self.batch.append((url, phonename, time.time(), sheet))
+        if len(self.batch) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self.batch:
+            return
+        if self.path.endswith(".parquet"):
+            rows = [(url, phonename, *row, fetched) for url, phonename, fetched, sheet in self.batch for row in sheet]
+            if rows:
+                columns = list(zip(*rows))
+                columns = ([self.pyarrow.array(values, self.pyarrow.string()).dictionary_encode() for values in columns[:4]]
+                           + [self.pyarrow.array(columns[4], self.pyarrow.string()),
+                              self.pyarrow.array(columns[5], self.pyarrow.float64())])
+                self.writer.write_table(self.pyarrow.Table.from_arrays(columns, schema=self.schema))
+        else:
+            for url, phonename, fetched, sheet in self.batch:
+                specs = {}
+                for section, key, value in sheet:
+                    specs.setdefault(section, {})[key] = value
+                self.file.write(json.dumps({"url": url, "phonename": phonename, "fetched": fetched, "specs": specs}) + "\n")
+            self.file.flush()
+        self.batch = []
+
+    def close(self):
+        self.flush()
+        if self.path.endswith(".parquet"):
+            close_parquet(self.path, self.writer)
+        else:
+            self.file.close()
+
+def read_spec_sheets(path:str) -> pd.DataFrame:
+    '''
+    Loads spec sheets written by SpecSheetWriter as a long DataFrame (url, phonename, section,
+    key, value, fetched) with categorical keys, only the latest capture of each device. A new column is
+    one pivot away, without a recrawl:
+
+        sheets = read_spec_sheets("OUTPUT/GSMARENA-SPECSHEETS.parquet")
+        weight = sheets[sheets["key"] == "Weight"].set_index("phonename")["value"]
+    '''
+    columns = ["url", "phonename", "section", "key", "value", "fetched"]
+    if path.endswith(".parquet"):
+        sheets = pd.read_parquet(path)
+    else:
+        rows = []
+        with gzip.open(path, "rt", encoding="utf-8") as file:
+            for line in file:
+                device = json.loads(line)
+                for section, keys in device["specs"].items():
+                    rows.extend((device["url"], device["phonename"], section, key, value, device["fetched"])
+                                for key, value in keys.items())
+        sheets = pd.DataFrame(rows, columns=columns).astype({column: "category" for column in columns[:4]})
+    # a device captured again by an appending run supersedes its earlier capture
+    latest = sheets["fetched"] == sheets.groupby("url", observed=True)["fetched"].transform("max")
+    return sheets[latest].reset_index(drop=True)
+
+SINKS = {".csv": CSVSink, ".jsonl": JSONLSink, ".db": SQLiteSink, ".sqlite": SQLiteSink, ".parquet": ParquetSink}
+
+def open_sink(path:str, batch_size:Optional[int] = None, append:bool = False) -> RowSink:
+    '''
+    Opens the sink matching the file extension of `path` (.csv, .jsonl, .db/.sqlite or .parquet).
+    With append the rows already in it are kept, otherwise it starts out empty.
+    '''
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in SINKS:
+        raise ValueError(f"no sink for {extension or path}, use one of {list(SINKS)}")
+    if batch_size is None:
+        return SINKS[extension](path, append=append)
+    return SINKS[extension](path, batch_size, append=append)
+
+class FetchError(Exception):
+    def __init__(self, url:str, status:Optional[int] = None, retry_after:Optional[float] = None):
+        '''
+        A page could not be fetched. `status` is the HTTP status, None for network failures.
+        `retry_after` is the server's Retry-After in seconds, if it sent one.
+        '''
+        super().__init__(f"{status or 'network error'} fetching {url}")
+        self.url = url
+        self.status = status
+        self.retry_after = retry_after
+
+    @property
+    def retryable(self) -> bool:
+        return self.status is None or self.status == 429 or self.status >= 500
+
+def parse_retry_after(value:Optional[str]) -> Optional[float]:
+    '''
+    Converts a Retry-After header (seconds or an HTTP date) into seconds from now.
+    '''
+    if not value:
+        return None
+    if value.strip().isdigit():
+        return float(value)
+    try:
+        return max(email.utils.parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+class RateLimiter:
+    def __init__(self, interval:float, burst:int = 1):
+        '''
+        Thread-safe token bucket shared by every fetcher thread, so the request budget
+        holds globally no matter how many workers are running.
+
+        PARAMS
+        -----
+        interval: float
+            Seconds between requests, i.e. one token every `interval` seconds. 0 disables limiting.
+        burst: int
+            The number of requests allowed back to back before limiting kicks in.
+        '''
+        self.interval = interval
+        self.burst = burst
+        self.lock = threading.Lock()
+        self.next_slot = time.monotonic()
+
+    def acquire(self) -> float:
+        '''
+        Blocks until a token is available. Returns the number of seconds waited.
+        '''
+        with self.lock:
+            now = time.monotonic()
+            slot = max(self.next_slot, now - (self.burst - 1) * self.interval)
+            self.next_slot = slot + self.interval
+        wait = slot - now
+        if wait > 0:
+            time.sleep(wait)
+        return max(wait, 0)
+
+    def success(self, latency:float):
+        '''
+        Called after every successful fetch with its latency. The fixed limiter ignores it.
+        '''
+
+    def throttled(self, delay:float):
+        '''
+        Holds every worker back for `delay` seconds, e.g. after a 429 or a 5xx.
+        '''
+        with self.lock:
+            self.next_slot = max(self.next_slot, time.monotonic() + delay)
+
+class AdaptiveRateLimiter(RateLimiter):
+    def __init__(self, interval:float, min_interval:Optional[float] = None, max_interval:float = 300,
+                 latency_factor:float = 3.0):
+        '''
+        AIMD rate limiter. Every healthy response adds a little to the request rate until it
+        reaches 1/min_interval, while throttling (429, 5xx) or a latency spike cuts it multiplicatively.
+
+        PARAMS
+        -----
+        interval: float
+            Starting seconds between requests.
+        min_interval: float
+            The fastest the limiter may go. Defaults to `interval`, so it only ever slows down
+            and recovers.
+        max_interval: float
+            The slowest the limiter may go.
+        latency_factor: float
+            A response this many times slower than the running average counts as congestion.
+        '''
+        super().__init__(interval)
+        self.min_interval = interval if min_interval is None else min_interval
+        self.max_interval = max_interval
+        self.latency_factor = latency_factor
+        self.latency = None  # moving average of latencies
+        self.last_decrease = 0.0
+
+    def decrease(self, factor:float) -> bool:
+        # cut the rate at most once per interval, a burst of failures from requests already in
+        # flight is one congestion signal, not many. Caller holds the lock.
+        now = time.monotonic()
+        if now - self.last_decrease < max(self.interval, 1.0):
+            return False
+        self.last_decrease = now
+        self.interval = min(self.max_interval, max(self.interval * factor, 1.0))
+        return True
+
+    def success(self, latency:float):
+        with self.lock:
+            spike = self.latency is not None and latency > self.latency * self.latency_factor
+            # spikes count towards the average too, so a lasting step up becomes the new baseline
+            self.latency = latency if self.latency is None else 0.8 * self.latency + 0.2 * latency
+            if spike:
+                self.decrease(1.5)
+                return
+            if self.interval <= self.min_interval:
+                return
+            if self.min_interval > 0:
+                # additive increase of the rate, a tenth of the top rate per healthy response
+                self.interval = max(self.min_interval, 1 / (1 / self.interval + 0.1 / self.min_interval))
+            else:
+                self.interval = self.interval / 2 if self.interval > 0.01 else 0.0
+
+    def throttled(self, delay:float):
+        with self.lock:
+            self.decrease(2)
+        super().throttled(delay)
+
+class PageCache:
+    def __init__(self, directory:str = "CACHE", ttl_days:float = 7, max_size_mb:int = 2048):
+        '''
+        Content-addressed on-disk cache of fetched pages. Pages are stored gzip-compressed under
+        the SHA-1 of their HTML, an SQLite index maps each URL to its page along with its ETag,
+        Last-Modified, fetch time and last access. The least recently used pages are evicted once
+        the cache grows past max_size_mb.
+
+        PARAMS
+        -----
+        directory: str
+            Where the cache lives.
+        ttl_days: float
+            How long a page is served without asking the server again. Stale pages are
+            revalidated with If-None-Match/If-Modified-Since when the server gave validators.
+        max_size_mb: int
+            The size cap of the compressed pages.
+        '''
+        self.directory = directory
+        self.ttl = ttl_days * 86400
+        self.max_size = max_size_mb * 1024 * 1024
+        self.lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self.db = sqlite3.connect(os.path.join(directory, "index.db"), check_same_thread=False)
+        self.db.execute("CREATE TABLE IF NOT EXISTS pages (url TEXT PRIMARY KEY, digest TEXT, etag TEXT, "
+                        "last_modified TEXT, fetched REAL, accessed REAL, size INTEGER)")
+        self.db.execute("CREATE INDEX IF NOT EXISTS pages_accessed ON pages (accessed)")
+        self.db.commit()
+        self.size = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM (SELECT DISTINCT digest, size FROM pages)").fetchone()[0]
+
+    def blob_path(self, digest:str) -> str:
+        return os.path.join(self.directory, digest[:2], f"{digest}.html.gz")
+
+    def lookup(self, url:str) -> Optional[dict]:
+        '''
+        Returns the cache entry of a URL, or None if it is not cached.
+        '''
+        with self.lock:
+            row = self.db.execute("SELECT digest, etag, last_modified, fetched FROM pages WHERE url = ?", (url,)).fetchone()
+        if row is None or not os.path.exists(self.blob_path(row[0])):
+            return None
+        return {"digest": row[0], "etag": row[1], "last_modified": row[2], "fetched": row[3]}
+
+    def read(self, url:str, entry:dict) -> str:
+        '''
+        Returns the HTML of a cache entry and marks it as recently used.
+        '''
+        with self.lock:
+            self.db.execute("UPDATE pages SET accessed = ? WHERE url = ?", (time.time(), url))
+            self.db.commit()
+        with open(self.blob_path(entry["digest"]), "rb") as file:
+            return gzip.decompress(file.read()).decode("utf-8")
+
+    def fresh(self, url:str) -> Optional[str]:
+        '''
+        Returns the cached HTML of a URL if it is younger than the TTL, otherwise None.
+        '''
+        entry = self.lookup(url)
+        if entry is None or time.time() - entry["fetched"] >= self.ttl:
+            return None
+        return self.read(url, entry)
+
+    def revalidated(self, url:str, entry:dict) -> str:
+        '''
+        Marks a stale entry as fresh again after the server answered 304, and returns its HTML.
+        '''
+        with self.lock:
+            self.db.execute("UPDATE pages SET fetched = ? WHERE url = ?", (time.time(), url))
+            self.db.commit()
+        return self.read(url, entry)
+
+    def store(self, url:str, source:str, etag:Optional[str] = None, last_modified:Optional[str] = None):
+        '''
+        Caches the HTML of a URL, evicting the least recently used pages if the cache is full.
+        '''
+        data = source.encode("utf-8")
+        digest = hashlib.sha1(data).hexdigest()
+        path = self.blob_path(digest)
+        compressed = gzip.compress(data)
+        with self.lock:
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(f"{path}.tmp", "wb") as file:
+                    file.write(compressed)
+                os.replace(f"{path}.tmp", path)
+                self.size += len(compressed)
+            previous = self.db.execute("SELECT digest, size FROM pages WHERE url = ?", (url,)).fetchone()
+            now = time.time()
+            self.db.execute("INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?)",
+                            (url, digest, etag, last_modified, now, now, len(compressed)))
+            # the page changed, its old version goes unless another URL still uses it
+            if previous is not None and previous[0] != digest:
+                self.release(*previous)
+            self.db.commit()
+            if self.size > self.max_size:
+                self.evict(keep=url)
+
+    def release(self, digest:str, size:int):
+        # pages are content-addressed, another URL may share the same file, caller holds the lock
+        if self.db.execute("SELECT 1 FROM pages WHERE digest = ?", (digest,)).fetchone() is None:
+            if os.path.exists(self.blob_path(digest)):
+                os.remove(self.blob_path(digest))
+            self.size -= size
+
+    def evict(self, keep:Optional[str] = None):
+        # drops least recently used pages, except `keep`, until 90% of the cap, caller holds the lock
+        rows = self.db.execute("SELECT url, digest, size FROM pages ORDER BY accessed").fetchall()
+        for url, digest, size in rows:
+            if self.size <= self.max_size * 0.9:
+                break
+            if url == keep:
+                continue
+            self.db.execute("DELETE FROM pages WHERE url = ?", (url,))
+            self.release(digest, size)
+        self.db.commit()
+
+class HTTPFetcher:
+    thread_safe = True
+
+    def __init__(self, user_agent:str = USER_AGENT, pool_size:int = 10, timeout:int = 30,
+                 cache:Optional[PageCache] = None):
+        '''
+        Fetches raw HTML over pooled keep-alive HTTP connections, no browser involved.
+
+        PARAMS
+        -----
+        user_agent: str
+            The User-Agent header sent with every request.
+        pool_size: int
+            The number of keep-alive connections kept open per host.
+        timeout: int
+            Seconds to wait for a response before giving up.
+        cache: PageCache
+            Where responses are stored and revalidated against. Optional.
+        '''
+        self.timeout = timeout
+        self.cache = cache
+        self.session = requests.Session()
+        self.session.headers.update({"User-Agent": user_agent})
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def get(self, url:str) -> str:
+        '''
+        Returns the HTML source of the given URL. Pages already in the cache are
+        revalidated with a conditional request.
+        '''
+        entry = self.cache.lookup(url) if self.cache is not None else None
+        headers = {}
+        if entry is not None:
+            if entry["etag"]:
+                headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                headers["If-Modified-Since"] = entry["last_modified"]
+        try:
+            response = self.session.get(url, headers=headers, timeout=self.timeout)
+        except requests.RequestException as error:
+            raise FetchError(url) from error
+        if entry is not None and response.status_code == 304:
+            return self.cache.revalidated(url, entry)
+        if response.status_code >= 400:
+            raise FetchError(url, response.status_code, parse_retry_after(response.headers.get("Retry-After")))
+        if self.cache is not None:
+            self.cache.store(url, response.text, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+        return response.text
+
+    def crawl_delay(self, url:str) -> Optional[float]:
+        '''
+        Returns the Crawl-delay robots.txt asks of our User-Agent for the site of `url`, if any.
+        '''
+        try:
+            response = self.session.get(urljoin(url, "/robots.txt"), timeout=self.timeout)
+        except requests.RequestException:
+            return None
+        if response.status_code != 200:
+            return None
+        robots = RobotFileParser()
+        robots.parse(response.text.splitlines())
+        delay = robots.crawl_delay(self.session.headers["User-Agent"])
+        return float(delay) if delay is not None else None
+
+    def close(self):
+        self.session.close()
+
+class SeleniumFetcher:
+    thread_safe = False
+
+    def __init__(self, user_agent:str = USER_AGENT, cache:Optional[PageCache] = None):
+        '''
+        Fetches rendered HTML through a Chrome WebDriver. Kept as a fallback for pages
+        that need a real browser.
+
+        PARAMS
+        -----
+        user_agent: str
+            The User-Agent the browser identifies itself with.
+        cache: PageCache
+            Where pages are stored. WebDriver exposes no response headers, so cached pages
+            are only reused while fresh, never revalidated. Optional.
+        '''
+        self.cache = cache
+        options = Options()
+        options.add_argument(f'user-agent={user_agent}')
+        self.driver = webdriver.Chrome(options=options)
+
+    def get(self, url:str) -> str:
+        '''
+        Returns the page source of the given URL after the browser has loaded it.
+        '''
+        try:
+            self.driver.get(url)
+            source = self.driver.page_source
+        except WebDriverException as error:
+            raise FetchError(url) from error
+        if self.cache is not None:
+            self.cache.store(url, source)
+        return source
+
+    def close(self):
+        self.driver.quit()
+
+FETCHERS = {"http": HTTPFetcher, "selenium": SeleniumFetcher}
 
 class GSMARENAScraper:
-    def __init__(self, RATE_LIMIT:int = 20, autosave: bool = False, save_interval:int =20):
+    def __init__(self, RATE_LIMIT:float = 20, autosave: bool = False, save_interval:int =20, backend:str = "http",
+                 workers:int = 1, incremental:bool = False, ttl_days:float = 30, cache_dir:Optional[str] = None,
+                 cache_ttl_days:float = 7, cache_size_mb:int = 2048, brand_cache:Optional[str] = "OUTPUT/.brands.json",
+                 brand_ttl_hours:float = 24, metrics_dir:Optional[str] = None, metrics_interval:float = 60,
+                 adaptive:bool = False, min_rate_limit:Optional[float] = None, max_retries:int = 3,
+                 respect_robots:bool = True, sinks:Optional[List[RowSink]] = None, keep_records:bool = True,
+                 spec_sheets:Optional[SpecSheetWriter] = None, changelog:Optional[str] = None, rate_shares:int = 1):
         '''
         Initializes the GSMARENAScraper with the specified rate limit, autosave option, and save interval.
 
         PARAMS
         -----
-        RATE_LIMIT: int
-            The maximum number of requests to send per second.
+        RATE_LIMIT: float
+            Seconds between requests. The budget is global: with several workers the scraper
+            still sends at most 1/RATE_LIMIT requests per second.
         autosave: bool
-            Whether to automatically save the dataset at regular intervals.
+            Whether to keep a checkpoint journal (TEMP/<timestart>/journal.jsonl) the crawl
+            can be resumed from.
         save_interval: int
-            The number of requests to process before saving the dataset.
-        '''
-        self.dataset = pd.DataFrame({"manufacturer": [], 
-                                    "phonename": [], 
-                                    "releasedate": [], 
-                                    "os": [], 
-                                    "batsize": [], 
-                                    "battype": [], 
-                                    "scrsize": [], 
-                                    "scrtype": [], 
-                                    "nettech": [], 
-                                    "chipset": [], 
-                                    "cpu": [], 
-                                    "gpu": [], 
-                                    "internal": [], 
-                                    "maincammodule": [], 
-                                    "maincamvid": [], 
-                                    "selfcammodule": [], 
-                                    "selfcamvid": [], 
-                                    "price": []})
+            The number of devices between fsyncs of the journal. Every device is written
+            to it as soon as it is scraped.
+        backend: str
+            How pages are fetched: "http" (plain requests, no browser) or "selenium" (Chrome).
+        workers: int
+            The number of device pages fetched concurrently. The selenium backend always uses 1.
+        incremental: bool
+            Whether to skip devices already in OUTPUT/<brand>.csv that were fetched less than
+            ttl_days ago, and brands whose device count has not changed since the last crawl.
+        ttl_days: float
+            How old a device entry may get before an incremental crawl fetches it again.
+        cache_dir: str
+            Directory of the local page cache. None disables caching.
+        cache_ttl_days: float
+            How long cached pages are served without contacting the server. Cache hits skip
+            the rate limiter entirely.
+        cache_size_mb: int
+            The size cap of the page cache.
+        brand_cache: str
+            File the brand index from makers.php3 is kept in between runs. None always fetches it.
+        brand_ttl_hours: float
+            How long the brand index file is trusted. Incremental crawls compare device counts
+            from it, so keep it short enough to notice new phones.
+        metrics_dir: str
+            Where crawl metrics are reported (metrics.jsonl and metrics.prom). None only collects
+            them in self.metrics.
+        metrics_interval: float
+            Seconds between metric reports.
+        adaptive: bool
+            Whether to adapt the request rate (AIMD): speed up towards min_rate_limit while
+            responses are healthy, back off on 429s, 5xx and latency spikes.
+        min_rate_limit: float
+            The fewest seconds between requests adaptive mode may reach. Defaults to RATE_LIMIT.
+        max_retries: int
+            How often a failed request (429, 5xx, network error) is retried, with exponential
+            backoff or the server's Retry-After. A device page that still fails is skipped.
+        respect_robots: bool
+            Never go faster than the Crawl-delay in robots.txt (http backend only).
+        sinks: List[RowSink]
+            Receive every row as soon as it is scraped, see open_sink. Flushed at the end of
+            each brand and closed by close().
+        keep_records: bool
+            Whether to keep every row in memory (self.dataset). When False only the current
+            brand is held, so memory stays flat however many brands are crawled; the combined
+            CSV of scrapeALL is then stitched together from the per-brand CSVs on disk.
+        spec_sheets: SpecSheetWriter
+            Where to keep the full spec sheet of every device, every section and row rather
+            than only SPEC_FIELDS, taken from the same parse. None keeps just the dataset columns.
+        changelog: str
+            File to log added, changed and removed devices to, see ChangeLog. Devices are
+            compared by the row fingerprints in the device index, so only changed devices
+            have their previous row looked up, in OUTPUT/<brand>.csv.
+        rate_shares: int
+            How many processes split the request budget, set by scrape_sharded. RATE_LIMIT is
+            already scaled by the caller; the robots.txt Crawl-delay is multiplied by it here,
+            so all shards together never go faster than robots.txt allows.
+        '''
+        self.records = RecordBuffer()
+        self.sinks = list(sinks or [])
+        self.keep_records = keep_records
+        self.spec_sheets = spec_sheets
+        self.changelog = ChangeLog(changelog) if changelog else None
+        self.brand_devices = {}
+        self.listed = set()
+        self.old_rows = None
         self.rate_limit = RATE_LIMIT
+        self.limiter = AdaptiveRateLimiter(RATE_LIMIT, min_rate_limit) if adaptive else RateLimiter(RATE_LIMIT)
+        self.max_retries = max_retries
+        self.respect_robots = respect_robots
+        self.rate_shares = rate_shares
+        self.robots_checked = False
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+
+        # incremental crawling
+        self.incremental = incremental
+        self.ttl = ttl_days * 86400
+        self.device_index = DeviceIndex()
+        self.previous = {}
 
         # autosaver
         if autosave and not save_interval:
             raise ValueError("If autosave is enabled, save_interval must be specified")
         if autosave and save_interval <= 0:
             raise ValueError("If autosave is enabled, save_interval must be greater than 0")
-        self.autosave_check = autosave
+        self.save_interval = save_interval
+        self.journal = None
         if autosave:
-            self.save_interval = save_interval
-            self.index = 0
             self.timestart = datetime.datetime.now().strftime("%Y-%m-%d-%H%M")
+            self.journal = CheckpointJournal(f"TEMP/{self.timestart}/journal.jsonl", save_interval)
 
-        # initializes useragent
-        userAgent = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.3"
-        options = Options()
-        options.add_argument(f'user-agent={userAgent}')
-        self.driver = webdriver.Chrome()
-        self.driver.get("https://www.gsmarena.com/makers.php3")
-
-        # get brand information and URLS
-        brandList = self.driver.find_elements(By.XPATH, './/div[@class="st-text"]//tbody/tr//td')
-        self.brandINFO = []
-        for brand in brandList:
-            brand_link = brand.find_element(By.XPATH, './/a').get_attribute('href')
-            brandName, tot_devices = brand.find_element(By.XPATH, './/a').text.split("\n")
-            tot_devices = int(re.sub(r'\D', '', tot_devices))
-            self.brandINFO.append([brandName, tot_devices, brand_link])
-        self.brandINFO = pd.DataFrame(self.brandINFO, columns=["manufacturer", "total_devices", "link"])
-    
-    def autosave(self):
+        # progress restored from a journal by resume()
+        self.completed = set()
+        self.completed_pages = set()
+        self.completed_brands = set()
+        self.brand_start = {}
+
+        # progress callbacks, see add_listener
+        self.listeners = []
+        self.metrics = CrawlMetrics(metrics_dir, metrics_interval)
+
+        # fetch backend and brand index are created on first use, see fetcher and brandINFO
+        if backend not in FETCHERS:
+            raise ValueError(f"backend must be one of {list(FETCHERS)}")
+        self.backend = backend
+        self.cache = PageCache(cache_dir, cache_ttl_days, cache_size_mb) if cache_dir else None
+        self.workers = workers if FETCHERS[backend].thread_safe else 1
+        self.lazy_lock = threading.Lock()
+        self._fetcher = None
+        self._brandINFO = None
+        self.brand_cache = brand_cache
+        self.brand_ttl = brand_ttl_hours * 3600
+
+    @property
+    def fetcher(self):
         '''
-        Saves the dataset to a CSV file at regular intervals.
+        The fetch backend, started on the first request. Chrome is only launched when the
+        selenium backend actually has a page to load.
         '''
-        os.makedirs(f"TEMP/{self.timestart}", exist_ok=True)
-        
-        if self.index % self.save_interval == 0:
-            self.dataset.to_csv(f"TEMP/{self.timestart}/{self.index}.csv", index=False)
+        with self.lazy_lock:
+            if self._fetcher is None:
+                if self.backend == "http":
+                    self._fetcher = HTTPFetcher(pool_size=max(10, self.workers), cache=self.cache)
+                else:
+                    self._fetcher = FETCHERS[self.backend](cache=self.cache)
+            return self._fetcher
 
-    def scrape_content(self):
+    @property
+    def brandINFO(self) -> pd.DataFrame:
         '''
-        Scrapes the URLs from whatever page you're showing.
-        then scrapes the content from those URLs.
+        Every brand on makers.php3 with its device count and link. Loaded on first use, from
+        the brand cache file while it is younger than brand_ttl_hours, otherwise from the site.
         '''
-        content_URLs = []
-        content_elements = self.driver.find_elements(By.XPATH, './/div[@id="review-body"]/div[@class="makers"]/ul/li')
-        for element in content_elements:
-            content_URLs.append(element.find_element(By.XPATH, './/a').get_attribute('href'))
-        for url in tqdm(content_URLs, desc="Scraping phone"):
-            time.sleep(self.rate_limit)
-            self.driver.get(url)
-            self.getphonespec()
+        if self._brandINFO is None:
+            self._brandINFO = self.load_brand_index()
+        return self._brandINFO
 
-            if self.autosave_check:
-                self.index+=1
-                self.autosave()
+    def load_brand_index(self) -> pd.DataFrame:
+        columns = ["manufacturer", "total_devices", "link"]
+        if self.brand_cache and os.path.exists(self.brand_cache):
+            with open(self.brand_cache, encoding="utf-8") as file:
+                stored = json.load(file)
+            if time.time() - stored["fetched"] < self.brand_ttl:
+                return pd.DataFrame(stored["brands"], columns=columns)
 
-    def getphonespec(self):
+        # get brand information and URLS, one pass over the brand links
+        brands = []
+        for brand_anchor in BRAND_LINKS(self.load(MAKERS_URL)):
+            brandName = (brand_anchor.text or "").strip()
+            tot_devices = int(re.sub(r'\D', '', brand_anchor.xpath('string(.//span)')) or 0)
+            brands.append([brandName, tot_devices, brand_anchor.get('href')])
+
+        if self.brand_cache:
+            os.makedirs(os.path.dirname(self.brand_cache) or ".", exist_ok=True)
+            temp_path = f"{self.brand_cache}.{os.getpid()}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as file:
+                json.dump({"fetched": time.time(), "brands": brands}, file)
+            os.replace(temp_path, self.brand_cache)
+        return pd.DataFrame(brands, columns=columns)
+
+    def fetch_page(self, url:str):
         '''
-        Scrapes the specifications of a phone from its detail page.
+        Fetches a page through the configured backend and parses it, with every link made absolute.
+        Fresh cache hits are served without waiting for the rate limiter. Safe to call from worker threads.
         '''
-        phone_spec_box = self.driver.find_element(By.XPATH, './/div[@id="body"]/div[1]')  # Get phone specifications box
+        source = self.cache.fresh(url) if self.cache is not None else None
+        if source is None:
+            source = self.fetch_with_retries(url)
+        else:
+            self.metrics.inc("cache_hits")
+        self.metrics.inc("pages")
+        start = time.perf_counter()
+        page = html.fromstring(source, base_url=url)
+        page.make_links_absolute(url)
+        self.metrics.observe("parse", time.perf_counter() - start)
+        return page
 
-        try:
-            phoneName = phone_spec_box.find_element(By.XPATH, './/h1[@class="specs-phone-name-title"]').text
-        except:
-            phoneName = "Na"
+    def fetch_with_retries(self, url:str) -> str:
+        '''
+        Fetches a page under the rate limiter, retrying retryable failures up to max_retries
+        times. Each failure holds every worker back: for the server's Retry-After when given,
+        otherwise for an exponential backoff.
+        '''
+        self.apply_crawl_delay()
+        for attempt in range(self.max_retries + 1):
+            self.metrics.observe("limiter_wait", self.limiter.acquire())
+            start = time.perf_counter()
+            try:
+                source = self.fetcher.get(url)
+            except FetchError as error:
+                self.metrics.inc("fetch_errors")
+                if not error.retryable or attempt == self.max_retries:
+                    raise
+                self.metrics.inc("retries")
+                self.limiter.throttled(error.retry_after if error.retry_after is not None else min(2 ** attempt, 60))
+                continue
+            latency = time.perf_counter() - start
+            self.metrics.observe("fetch", latency)
+            self.limiter.success(latency)
+            return source
 
-        try:
-            releasedate = phone_spec_box.find_element(By.XPATH, './/span[@data-spec="released-hl"]').text.removeprefix("Released ")
-        except:
-            releasedate = "Na"
+    def apply_crawl_delay(self):
+        # robots.txt is read once, on the first request that goes to the network
+        with self.lazy_lock:
+            if self.robots_checked:
+                return
+            self.robots_checked = True
+        if not self.respect_robots or not isinstance(self.fetcher, HTTPFetcher):
+            return
+        delay = self.fetcher.crawl_delay(MAKERS_URL)
+        if delay:
+            delay *= self.rate_shares
+            with self.limiter.lock:
+                self.limiter.interval = max(self.limiter.interval, delay)
+                if isinstance(self.limiter, AdaptiveRateLimiter):
+                    self.limiter.min_interval = max(self.limiter.min_interval, delay)
 
-        try:
-            os = phone_spec_box.find_element(By.XPATH, './/span[@data-spec="os-hl"]').text
-        except:
-            os = "Na"
+    def load(self, url:str):
+        '''
+        Fetches a page and makes it the current page (self.page).
+        '''
+        self.page = self.fetch_page(url)
+        return self.page
 
-        # battery
-        try:
-            batsize = phone_spec_box.find_element(By.XPATH, './/span[@data-spec="batsize-hl"]').text
-        except:
-            batsize = "Na"
+    @property
+    def dataset(self) -> pd.DataFrame:
+        '''
+        Every row scraped so far as a DataFrame, built from the record buffer on access.
+        '''
+        return self.records.to_frame()
 
-        try:
-            battype = phone_spec_box.find_element(By.XPATH, './/div[@data-spec="battype-hl"]').text
-        except:
-            battype = "Na"
+    def add_listener(self, callback:Callable):
+        '''
+        Registers a progress callback. It is called as callback(event, **data) from the
+        scraping thread for each of these events:
 
-        # screen
-        try:
-            scrsize = phone_spec_box.find_element(By.XPATH, './/div[@data-spec="displayres-hl"]').text.strip(" pixels")
-        except:
-            scrsize = "Na"
+            brand_start     brand, total_devices
+            page            brand, number, pages
+            device          brand, url, record
+            brand_done      brand, rows
+        '''
+        self.listeners.append(callback)
 
-        try:
-            scrtype = phone_spec_box.find_element(By.XPATH, './/td[@data-spec="displaytype"]').text
-        except:
-            scrtype = "Na"
+    def remove_listener(self, callback:Callable):
+        self.listeners.remove(callback)
 
-        try:
-            nettech = phone_spec_box.find_element(By.XPATH, './/a[@data-spec="nettech"]').text
-        except:
-            nettech = "Na"
+    def emit(self, event:str, **data):
+        for callback in list(self.listeners):
+            callback(event, **data)
 
-        # platform
-        try:
-            chipset = phone_spec_box.find_element(By.XPATH, './/td[@data-spec="chipset"]').text
-        except:
-            chipset = "Na"
+    def checkpoint(self, event:dict):
+        '''
+        Writes a progress event to the checkpoint journal, if there is one.
+        '''
+        if self.journal is not None:
+            self.journal.write(event)
 
-        try:
-            cpu = phone_spec_box.find_element(By.XPATH, './/td[@data-spec="cpu"]').text
-        except:
-            cpu = "Na"
+    def add_record(self, url:str, record:dict, fetched:bool = True):
+        '''
+        Appends a scraped row to the dataset and journals it. Rows reused from the previous
+        crawl (fetched=False) reach the sinks without their url.
+        '''
+        self.records.append(record)
+        for sink in self.sinks:
+            sink.write(url if fetched else None, record)
+        self.checkpoint({"type": "device", "brand": self.brandKey, "url": url, "record": record})
+        self.emit("device", brand=self.brandKey, url=url, record=record)
 
-        try:
-            gpu = phone_spec_box.find_element(By.XPATH, './/td[@data-spec="gpu"]').text
-        except:
-            gpu = "Na"
+    def resume(self, path:str):
+        '''
+        Reloads a checkpoint journal written by an interrupted crawl. Its rows are restored into
+        the dataset and brand_scrape/scrapeALL then skip every brand, listing page and device it
+        already holds, continuing exactly where the crawl stopped. New progress is appended
+        to the same journal.
 
-        try:
-            internal = phone_spec_box.find_element(By.XPATH, './/td[@data-spec="internalmemory"]').text
-        except:
-            internal = "Na"
+        PARAMS
+        -----
+        path: str
+            The journal file, e.g. TEMP/<timestart>/journal.jsonl.
+        '''
+        for event in CheckpointJournal.read(path):
+            if event["type"] == "device":
+                self.brand_start.setdefault(event["brand"], len(self.records))
+                self.records.append(event["record"])
+                if event["url"]:
+                    self.completed.add(event["url"])
+            elif event["type"] == "page":
+                self.completed_pages.add(event["url"])
+            elif event["type"] == "brand":
+                self.completed_brands.add(event["brand"])
+        if self.journal is not None:
+            self.journal.close()
+        self.journal = CheckpointJournal(path, self.save_interval)
 
-        # main camera
-        try:
-            maincammodule = phone_spec_box.find_element(By.XPATH, './/td[@data-spec="cam1modules"]').text
-        except:
-            maincammodule = "Na"
+    def queue_devices(self, executor:ThreadPoolExecutor, page) -> List[tuple]:
+        '''
+        Queues a fetch for every device listed on a listing page that still needs a row.
+        Returns (url, future) pairs in listing order, where incremental mode may put the
+        previous row in place of the future.
+        '''
+        content_URLs = []
+        content_elements = DEVICE_ITEMS(page)
+        for element in content_elements:
+            content_URLs.append(element.xpath('.//a')[0].get('href'))
+        self.listed.update(content_URLs)
+        # devices restored from a checkpoint journal are already in the dataset
+        content_URLs = [url for url in content_URLs if url not in self.completed]
 
-        try:
-            maincamvid = phone_spec_box.find_element(By.XPATH, './/td[@data-spec="cam1video"]').text
-        except:
-            maincamvid = "Na"
+        queued = []
+        for url in content_URLs:
+            # incremental mode reuses the previous row of devices that are still fresh
+            entry = self.device_index.devices.get(url)
+            if self.incremental and self.device_index.is_fresh(url, self.ttl) and entry["phonename"] in self.previous:
+                queued.append((url, self.previous[entry["phonename"]]))
+            else:
+                queued.append((url, executor.submit(self.fetch_page, url)))
+        return queued
 
-        # selfie camera
-        try:
-            selfcammodule = phone_spec_box.find_element(By.XPATH, './/td[@data-spec="cam2modules"]').text
-        except:
-            selfcammodule = "Na"
+    def discover(self, executor:ThreadPoolExecutor, page_url:str) -> List[tuple]:
+        '''
+        Fetches a listing page and queues its devices, see queue_devices.
+        '''
+        return self.queue_devices(executor, self.fetch_page(page_url))
 
-        try:
-            selfcamvid = phone_spec_box.find_element(By.XPATH, './/td[@data-spec="cam2video"]').text
-        except:
-            selfcamvid = "Na"
+    def collect_devices(self, queued:List[tuple]):
+        '''
+        Turns queued devices into rows, in listing order, as their pages arrive.
+        '''
+        for url, item in tqdm(queued, desc="Scraping phone"):
+            if isinstance(item, dict):
+                self.add_record(url, item, fetched=False)
+                continue
+            try:
+                page = item.result()
+            except FetchError as error:
+                # retries are used up, skip the device rather than the whole brand
+                print(f"WARNING: skipping device, {error}")
+                continue
+            self.getphonespec(page)
 
-        # price
-        try:
-            price = phone_spec_box.find_element(By.XPATH, './/td[@data-spec="price"]').text.strip("About ")
-        except:
-            price = "Na"
-
-        self.dataset = pd.concat([self.dataset, pd.DataFrame({"manufacturer": [self.brandName],
-                                                               "phonename": [phoneName],
-                                                               "releasedate": [releasedate],
-                                                               "os": [os],
-                                                               "batsize": [batsize],
-                                                               "battype": [battype],
-                                                               "scrsize": [scrsize],
-                                                               "scrtype": [scrtype],
-                                                               "nettech": [nettech],
-                                                               "chipset": [chipset],
-                                                               "cpu": [cpu],
-                                                               "gpu": [gpu],
-                                                               "internal": [internal],
-                                                               "maincammodule": [maincammodule],
-                                                               "maincamvid": [maincamvid],
-                                                               "selfcammodule": [selfcammodule],
-                                                               "selfcamvid": [selfcamvid],
-                                                               "price": [price]})], 
-                                                               ignore_index=True)
+    def scrape_content(self):
+        '''
+        Scrapes the URLs from whatever page you're showing.
+        then scrapes the content from those URLs.
+        '''
+        # workers fetch and parse while this thread extracts, rows keep listing order
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            self.collect_devices(self.queue_devices(executor, self.page))
+
+    def getphonespec(self, page = None):
+        '''
+        Scrapes the specifications of a phone from its detail page.
+
+        PARAMS
+        -----
+        page:
+            The parsed device page. Defaults to the current page (self.page).
+        '''
+        page = self.page if page is None else page
+        start = time.perf_counter()
+        phone_spec_box = SPEC_BOX(page)[0]  # Get phone specifications box
+        record = {"manufacturer": self.brandName, **extract_spec(phone_spec_box)}
+        if self.spec_sheets is not None:
+            self.spec_sheets.write(page.base_url, record["phonename"], extract_spec_sheet(phone_spec_box))
+        fingerprint = record_hash(record)
+        self.metrics.observe("extract", time.perf_counter() - start)
+        self.metrics.record_fields(record)
+        self.metrics.report()
+        self.add_record(page.base_url, record)
+        if self.changelog is not None:
+            self.log_change(page.base_url, record, fingerprint)
+        self.device_index.add(page.base_url, self.brandKey, record, fingerprint)
+
+    def log_change(self, url:str, record:dict, fingerprint:str):
+        '''
+        Logs a freshly scraped device as added, or as changed when its fingerprint differs from
+        the device index. Only then is the brand's previous CSV read, once, for the field diff.
+        '''
+        entry = self.device_index.devices.get(url)
+        if entry is None:
+            self.changelog.write("added", self.brandKey, url, record["phonename"], record=record)
+            return
+        if entry["hash"] == fingerprint:
+            return
+        if self.old_rows is None:
+            self.old_rows = {}
+            if os.path.exists(f"OUTPUT/{self.brandKey}.csv"):
+                for row in pd.read_csv(f"OUTPUT/{self.brandKey}.csv", dtype=str, keep_default_na=False).to_dict("records"):
+                    self.old_rows[row["phonename"]] = row
+        old = self.old_rows.get(entry["phonename"])
+        fields = None
+        if old is not None:
+            fields = {column: [old.get(column), record.get(column)] for column in COLUMNS if old.get(column) != record.get(column)}
+        self.changelog.write("changed", self.brandKey, url, record["phonename"], fields=fields)
 
     def brand_scrape(self, brandName):
         '''
         Scrapes all phone models for a given brand.
         '''
-        URL = self.brandINFO[self.brandINFO["manufacturer"]== brandName]["link"].values[0]
-        self.driver.get(URL)
+        brand_row = self.brandINFO[self.brandINFO["manufacturer"]== brandName]
+        URL = brand_row["link"].values[0]
+        total_devices = int(brand_row["total_devices"].values[0])
+        self.brandKey = brandName
+        if brandName in self.completed_brands:
+            print(f"Skipping brand {brandName}, already in the checkpoint journal")
+            return
+        # first row of this brand, so its CSV holds only its own rows
+        start = self.brand_start.pop(brandName, len(self.records))
+        self.emit("brand_start", brand=brandName, total_devices=total_devices)
+
+        if self.incremental:
+            # rows of this brand from the previous run, by phone name
+            self.previous = {}
+            if os.path.exists(f"OUTPUT/{brandName}.csv"):
+                known = self.device_index.phonenames(brandName)
+                for record in pd.read_csv(f"OUTPUT/{brandName}.csv", dtype=str, keep_default_na=False).to_dict("records"):
+                    if record["phonename"] in known:
+                        self.previous[record["phonename"]] = record
+            if self.previous and self.device_index.brand_unchanged(brandName, total_devices, self.ttl):
+                print(f"Skipping brand {brandName}, {total_devices} devices unchanged since last crawl")
+                for record in self.previous.values():
+                    self.add_record(None, record)
+                for sink in self.sinks:
+                    sink.flush()
+                self.checkpoint({"type": "brand", "brand": brandName})
+                self.emit("brand_done", brand=brandName, rows=len(self.records) - start)
+                if not self.keep_records:
+                    self.records.truncate(start)
+                return
+
+        # what the device index knew about this brand before the crawl, for the change log
+        if self.changelog is not None:
+            self.brand_devices = {url: entry for url, entry in self.device_index.devices.items() if entry["brand"] == brandName}
+        self.listed = set()
+        self.old_rows = None
+
+        self.load(URL)
 
         try:
             # This checks if the page navigation element is present. If there's one page on the brand.
-            page_nav = self.driver.find_element(By.XPATH, './/div[@class="review-nav-v2"]//div[@class="nav-pages"]')
-            temp = re.findall(r'\d+', page_nav.text)
+            page_nav = PAGE_NAV(self.page)[0]
+            temp = re.findall(r'\d+', element_text(page_nav))
             current_index, last_index = int(temp[0]), int(temp[-1])
 
-            page_urlStructure = page_nav.find_elements(By.XPATH, './/a')[-1].get_attribute('href')
+            page_urlStructure = page_nav.xpath('.//a')[-1].get('href')
             PAGE_URLS = []
             for i in range(current_index+1, last_index + 1):
                 PAGE_URLS.append(re.sub(r'p\d+', f'p{i}', page_urlStructure))
@@ -240,16 +1625,47 @@ class GSMARENAScraper:
             # If single page!
             PAGE_URLS = []
 
-        self.brandName = self.driver.find_element(By.XPATH, './/h1["@class = article-info-name"]').text.split(" ")[0]
-        print(f"PAGE 1/{len(PAGE_URLS)+1} for brand {brandName}")
-        self.scrape_content()
-        for page_url in PAGE_URLS:
-            print(f"PAGE {PAGE_URLS.index(page_url)+2}/{len(PAGE_URLS)+1} for brand {brandName}")
-            self.driver.get(page_url)
-            self.scrape_content()
+        self.brandName = element_text(BRAND_TITLE(self.page)[0]).split(" ")[0]
+        pending_pages = [(number, page_url) for number, page_url in enumerate(PAGE_URLS, start=2)
+                         if page_url not in self.completed_pages]
+
+        executor = ThreadPoolExecutor(max_workers=self.workers)
+        try:
+            # discovery stage: every listing page is requested up front, each one queues
+            # its devices as soon as it arrives so the workers never run dry between pages
+            discovered = [executor.submit(self.discover, executor, page_url) for _, page_url in pending_pages]
+            print(f"PAGE 1/{len(PAGE_URLS)+1} for brand {brandName}")
+            self.emit("page", brand=brandName, number=1, pages=len(PAGE_URLS)+1)
+            self.collect_devices(self.queue_devices(executor, self.page))
+            self.checkpoint({"type": "page", "brand": brandName, "url": URL})
+            for (number, page_url), queued in zip(pending_pages, discovered):
+                print(f"PAGE {number}/{len(PAGE_URLS)+1} for brand {brandName}")
+                self.emit("page", brand=brandName, number=number, pages=len(PAGE_URLS)+1)
+                self.collect_devices(queued.result())
+                self.checkpoint({"type": "page", "brand": brandName, "url": page_url})
+        finally:
+            executor.shutdown(cancel_futures=True)
+
+        # removals are only certain when every listing page was seen in this run
+        if self.changelog is not None and len(pending_pages) == len(PAGE_URLS):
+            for url in self.brand_devices.keys() - self.listed:
+                self.changelog.write("removed", brandName, url, self.brand_devices[url]["phonename"])
+                self.device_index.forget(url)
 
         os.makedirs("OUTPUT", exist_ok=True)
-        self.dataset.to_csv(f"OUTPUT/{brandName}.csv", index=False)
+        self.records.to_frame(start).to_csv(f"OUTPUT/{brandName}.csv", index=False)
+        self.device_index.set_brand(brandName, total_devices)
+        self.device_index.save()
+        for sink in self.sinks:
+            sink.flush()
+        if self.spec_sheets is not None:
+            self.spec_sheets.flush()
+        self.checkpoint({"type": "brand", "brand": brandName})
+        self.emit("brand_done", brand=brandName, rows=len(self.records) - start)
+        self.metrics.report(force=True)
+        if not self.keep_records:
+            # the brand is in its CSV and the sinks, rows restored before it stay valid
+            self.records.truncate(start)
 
     def scrapeALL(self):
         '''
@@ -257,22 +1673,395 @@ class GSMARENAScraper:
         '''
         for brand in tqdm(self.brandINFO["manufacturer"], desc="Scraping all brands"):
             self.brand_scrape(brand)
-        self.dataset.to_csv(f"OUTPUT/!GSMARENA-DATASET.csv", index=False)
+        if self.keep_records:
+            self.dataset.to_csv(f"OUTPUT/!GSMARENA-DATASET.csv", index=False)
+        else:
+            concat_outputs(self.brandINFO["manufacturer"])
+        self.close()
+
+    def close(self):
+        '''
+        Flushes and closes the sinks, spec sheet writer and change log and shuts the fetch backend down. Called by scrapeALL.
+        '''
+        for sink in self.sinks:
+            sink.close()
+        self.sinks = []
+        if self.spec_sheets is not None:
+            self.spec_sheets.close()
+            self.spec_sheets = None
+        if self.changelog is not None:
+            self.changelog.close()
+            self.changelog = None
+        with self.lazy_lock:
+            if self._fetcher is not None:
+                self._fetcher.close()
+                self._fetcher = None
+
+    def scrape_shard(self, queue_path:str, worker:Optional[str] = None):
+        '''
+        Claims brands from a shared work queue and scrapes them one at a time into
+        OUTPUT/<brand>.csv until the queue is empty. Any number of processes or machines
+        can work the same queue.
+
+        PARAMS
+        -----
+        queue_path: str
+            The SQLite work queue, see BrandQueue.
+        worker: str
+            A name for this worker, recorded on the brands it claims. Defaults to host:pid.
+        '''
+        queue = BrandQueue(queue_path)
+        worker = worker or f"{os.uname().nodename}:{os.getpid()}"
+        while (brand := queue.claim(worker)) is not None:
+            self.records = RecordBuffer()  # only the current brand is held in memory
+            try:
+                self.brand_scrape(brand)
+            except Exception as error:
+                # hand the brand back so a later claim or run retries it, and go on with the next
+                print(f"WARNING: brand {brand} failed, {type(error).__name__}: {error}")
+                queue.release(brand)
+                continue
+            queue.done(brand)
+        self.close()
+
+class BrandQueue:
+    def __init__(self, path:str = "OUTPUT/.queue.db", lease:float = 6 * 3600, max_attempts:int = 3):
+        '''
+        SQLite-backed work queue of brands for sharded crawls. Brands are handed out largest
+        first (by total_devices), which keeps workers evenly loaded. A brand whose scrape failed
+        is handed out again up to max_attempts times. A brand claimed by a worker that died
+        without releasing it is handed out again once its lease expires, or right away when
+        scrape_sharded notices its local worker died or resumes the queue.
+
+        PARAMS
+        -----
+        path: str
+            The queue file. Shared by every worker, so it must be reachable from all of them.
+        lease: float
+            Seconds a worker may hold a brand before it is considered dead.
+        max_attempts: int
+            How often a brand is tried before it is left for the next run.
+        '''
+        self.path = path
+        self.lease = lease
+        self.max_attempts = max_attempts
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.db = sqlite3.connect(path, timeout=60, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("CREATE TABLE IF NOT EXISTS brands (manufacturer TEXT PRIMARY KEY, total_devices INTEGER, "
+                        "status TEXT DEFAULT 'pending', worker TEXT, claimed REAL, attempts INTEGER DEFAULT 0)")
+        if "attempts" not in {row[1] for row in self.db.execute("PRAGMA table_info(brands)")}:
+            self.db.execute("ALTER TABLE brands ADD COLUMN attempts INTEGER DEFAULT 0")
+
+    def populate(self, brandINFO:pd.DataFrame, resume:bool = False):
+        '''
+        Queues every brand of a brandINFO table for a new run, forgetting the previous one.
+        With resume, brands already done stay done and everything else is handed out again
+        with fresh attempts, including brands a killed run left running.
+        '''
+        self.db.execute("BEGIN IMMEDIATE")
+        if not resume:
+            self.db.execute("DELETE FROM brands")
+        self.db.executemany("INSERT OR IGNORE INTO brands (manufacturer, total_devices) VALUES (?, ?)",
+                            brandINFO[["manufacturer", "total_devices"]].itertuples(index=False))
+        self.db.execute("UPDATE brands SET status = 'pending', worker = NULL, attempts = 0 WHERE status != 'done'")
+        self.db.execute("COMMIT")
+
+    def claim(self, worker:str) -> Optional[str]:
+        '''
+        Hands the largest unclaimed brand to a worker. Returns None once every brand is taken.
+        '''
+        self.db.execute("BEGIN IMMEDIATE")
+        row = self.db.execute("SELECT manufacturer FROM brands WHERE (status = 'pending' AND attempts < ?) "
+                              "OR (status = 'running' AND claimed < ?) ORDER BY total_devices DESC LIMIT 1",
+                              (self.max_attempts, time.time() - self.lease)).fetchone()
+        if row is not None:
+            self.db.execute("UPDATE brands SET status = 'running', worker = ?, claimed = ?, attempts = attempts + 1 "
+                            "WHERE manufacturer = ?", (worker, time.time(), row[0]))
+        self.db.execute("COMMIT")
+        return row[0] if row else None
+
+    def done(self, brand:str):
+        self.db.execute("UPDATE brands SET status = 'done' WHERE manufacturer = ?", (brand,))
+
+    def release(self, brand:str):
+        self.db.execute("UPDATE brands SET status = 'pending', worker = NULL WHERE manufacturer = ?", (brand,))
+
+    def release_worker(self, worker:str):
+        '''
+        Hands back every brand a dead worker still held.
+        '''
+        self.db.execute("UPDATE brands SET status = 'pending', worker = NULL WHERE status = 'running' AND worker = ?",
+                        (worker,))
+
+    def remaining(self) -> int:
+        return self.db.execute("SELECT COUNT(*) FROM brands WHERE status != 'done'").fetchone()[0]
+
+    def unfinished(self) -> List[str]:
+        return [row[0] for row in self.db.execute("SELECT manufacturer FROM brands WHERE status != 'done' "
+                                                  "ORDER BY total_devices DESC")]
+
+def shard_worker(queue_path:str, scraper_kwargs:dict):
+    # entry point of a local shard process
+    GSMARENAScraper(**scraper_kwargs).scrape_shard(queue_path)
+
+def merge_outputs(brands:Iterable[str], output:str = "OUTPUT/!GSMARENA-DATASET.csv") -> pd.DataFrame:
+    '''
+    Concatenates the per-brand CSVs of a sharded crawl, in the given brand order, into one dataset.
+    Raises RuntimeError, writing nothing, if a brand has no output file.
+    '''
+    brands = list(brands)
+    missing = [brand for brand in brands if not os.path.exists(f"OUTPUT/{brand}.csv")]
+    if missing:
+        raise RuntimeError(f"no output for {len(missing)} brand(s), rescrape them: {', '.join(missing)}")
+    frames = [pd.read_csv(f"OUTPUT/{brand}.csv", dtype=str, keep_default_na=False) for brand in brands]
+    dataset = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=COLUMNS)
+    dataset.to_csv(output, index=False)
+    return dataset
+
+def concat_outputs(brands:Iterable[str], output:str = "OUTPUT/!GSMARENA-DATASET.csv"):
+    '''
+    Like merge_outputs, but copies the per-brand CSVs line by line instead of loading them,
+    so it runs in constant memory.
+    '''
+    temp_path = f"{output}.{os.getpid()}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as merged:
+        merged.write(",".join(COLUMNS) + "\n")
+        for brand in brands:
+            if os.path.exists(f"OUTPUT/{brand}.csv"):
+                with open(f"OUTPUT/{brand}.csv", encoding="utf-8") as file:
+                    next(file, None)
+                    shutil.copyfileobj(file, merged)
+    os.replace(temp_path, output)
+
+def scrape_sharded(processes:int = 4, queue_path:str = "OUTPUT/.queue.db", resume:bool = False,
+                   **scraper_kwargs) -> pd.DataFrame:
+    '''
+    Scrapes every brand with `processes` local worker processes sharing one work queue,
+    then merges their per-brand outputs into OUTPUT/!GSMARENA-DATASET.csv. If any brand is
+    not done by then (it kept failing, or a worker died) nothing is merged and RuntimeError
+    names the missing brands; rerunning with resume retries exactly those. Other machines
+    can join by running GSMARENAScraper.scrape_shard on the same queue file.
+
+    PARAMS
+    -----
+    processes: int
+        The number of worker processes.
+    queue_path: str
+        The SQLite work queue.
+    resume: bool
+        Keep the brands an earlier run of this queue finished, instead of starting over.
+    scraper_kwargs:
+        Passed on to every GSMARENAScraper. RATE_LIMIT stays a global budget: each process
+        waits RATE_LIMIT * processes between its own requests, and likewise at least the
+        robots.txt Crawl-delay * processes. Autosave is disabled, the
+        queue already tracks which brands are done.
+    '''
+    scraper_kwargs["RATE_LIMIT"] = scraper_kwargs.get("RATE_LIMIT", 20) * processes
+    if scraper_kwargs.get("min_rate_limit") is not None:
+        scraper_kwargs["min_rate_limit"] *= processes
+    scraper_kwargs["rate_shares"] = processes
+    scraper_kwargs["autosave"] = False
+    brandINFO = GSMARENAScraper(**scraper_kwargs).brandINFO
+    queue = BrandQueue(queue_path)
+    queue.populate(brandINFO, resume)
+
+    workers = [multiprocessing.Process(target=shard_worker, args=(queue_path, scraper_kwargs)) for _ in range(processes)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+        if worker.exitcode != 0:
+            print(f"WARNING: shard worker {worker.pid} exited with code {worker.exitcode}")
+            queue.release_worker(f"{os.uname().nodename}:{worker.pid}")
+    if queue.remaining():
+        unfinished = queue.unfinished()
+        raise RuntimeError(f"{len(unfinished)} brand(s) not scraped, rerun to retry them: {', '.join(unfinished)}")
+    return merge_outputs(brandINFO["manufacturer"])
+
+def parse_device_source(data:bytes) -> Optional[dict]:
+    '''
+    Extracts a dataset row from the raw (optionally gzipped) HTML of a device page.
+    Returns None for anything that is not a device page, such as cached listing pages.
+    The manufacturer is the first word of the phone name, as brand pages are not at hand.
+    '''
+    if data[:2] == b"\x1f\x8b":
+        data = gzip.decompress(data)
+    spec_boxes = SPEC_BOX(html.fromstring(data))
+    if not spec_boxes:
+        return None
+    record = extract_spec(spec_boxes[0])
+    if record["phonename"] == "Na":
+        return None
+    return {"manufacturer": record["phonename"].split(" ")[0], **record}
+
+def reparse_file(path:str) -> Optional[dict]:
+    with open(path, "rb") as file:
+        return parse_device_source(file.read())
+
+def iter_archive(path:str) -> Iterator[bytes]:
+    '''
+    Yields the content of every file in a .zip or .tar(.gz) archive.
+    '''
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            for name in sorted(archive.namelist()):
+                if not name.endswith("/"):
+                    yield archive.read(name)
+    else:
+        with tarfile.open(path) as archive:
+            for member in archive:
+                if member.isfile():
+                    yield archive.extractfile(member).read()
+
+def reparse(source:str, processes:Optional[int] = None) -> pd.DataFrame:
+    '''
+    Rebuilds the dataset from saved device pages without touching the network, extracting
+    rows on a process pool across all cores. Output has the same columns as GSMARENAScraper.dataset.
+
+    PARAMS
+    -----
+    source: str
+        A page cache directory (see PageCache), a directory of saved pages (.html, optionally
+        gzipped) or a .zip/.tar archive of them.
+    processes: int
+        Worker processes. Defaults to the number of cores.
+    '''
+    with multiprocessing.Pool(processes) as pool:
+        if os.path.isdir(source):
+            index_path = os.path.join(source, "index.db")
+            if os.path.exists(index_path):
+                # page cache, only the current version of each URL
+                with sqlite3.connect(index_path) as db:
+                    digests = sorted({row[0] for row in db.execute("SELECT digest FROM pages")})
+                paths = [os.path.join(source, digest[:2], f"{digest}.html.gz") for digest in digests]
+            else:
+                paths = sorted(os.path.join(folder, name) for folder, _, names in os.walk(source) for name in names)
+            rows = pool.imap(reparse_file, paths, chunksize=32)
+        else:
+            rows = pool.imap(parse_device_source, iter_archive(source), chunksize=32)
+        records = RecordBuffer()
+        for record in tqdm(rows, desc="Reparsing pages"):
+            if record is not None:
+                records.append(record)
+    return records.to_frame()
+
+MONTHS = {month: number for number, month in enumerate(["January", "February", "March", "April", "May", "June", "July",
+                                                         "August", "September", "October", "November", "December"], start=1)}
+CURRENCY_SYMBOLS = {"$": "USD", "€": "EUR", "£": "GBP", "₹": "INR"}
+SIZE_IN_GB = {"KB": 1 / 1024 / 1024, "MB": 1 / 1024, "GB": 1, "TB": 1024}
+
+def release_month(releasedate:str) -> Optional[str]:
+    '''
+    Sortable release date of a raw releasedate string: "2017, September" -> "2017-09", "2017" -> "2017".
+    '''
+    released = re.search(r'(\d{4})(?:,\s*([A-Za-z]+))?', releasedate or "")
+    if released is None:
+        return None
+    month = MONTHS.get(released.group(2))
+    return f"{released.group(1)}-{month:02d}" if month else released.group(1)
+
+def normalize_dataset(dataset:pd.DataFrame) -> pd.DataFrame:
+    '''
+    Adds typed columns derived from the raw spec strings, using vectorized string ops only.
+    Raw columns are kept, values that cannot be parsed become null.
+
+    battery_mah         "3200"                          -> 3200
+    res_width/height    "1080x1920"                     -> 1080, 1920
+    release_year/month  "2017, September"               -> 2017, 9
+    storage_gb/ram_gb   "64GB 4GB RAM, 128GB 4GB RAM"   -> [64, 128], [4, 4]
+    price_value/currency "310 EUR" or "$ 299.99 / ..."  -> 310.0, "EUR"
+    '''
+    typed = dataset.reset_index(drop=True)
+    typed["battery_mah"] = pd.to_numeric(typed["batsize"].str.extract(r'(\d+)', expand=False), errors="coerce").astype("Int64")
+
+    resolution = typed["scrsize"].str.extract(r'(\d+)\s*x\s*(\d+)')
+    typed["res_width"] = pd.to_numeric(resolution[0], errors="coerce").astype("Int64")
+    typed["res_height"] = pd.to_numeric(resolution[1], errors="coerce").astype("Int64")
+
+    released = typed["releasedate"].str.extract(r'(\d{4})(?:,\s*([A-Za-z]+))?')
+    typed["release_year"] = pd.to_numeric(released[0], errors="coerce").astype("Int64")
+    typed["release_month"] = released[1].map(MONTHS).astype("Int64")
+
+    # one row per memory variant, then back to one list per phone
+    variants = typed["internal"].str.split(",").explode().str.extract(r'(\d+(?:\.\d+)?)\s*(KB|MB|GB|TB)(?:\s+(\d+(?:\.\d+)?)\s*(KB|MB|GB|TB)\s+RAM)?')
+    storage = pd.to_numeric(variants[0], errors="coerce") * variants[1].map(SIZE_IN_GB)
+    ram = pd.to_numeric(variants[2], errors="coerce") * variants[3].map(SIZE_IN_GB)
+    typed["storage_gb"] = storage.dropna().groupby(level=0).agg(list).reindex(typed.index)
+    typed["ram_gb"] = ram.dropna().groupby(level=0).agg(list).reindex(typed.index)
+
+    # "310 EUR" or, for newer phones, "$ 299.99 / € 279.00 / ..."
+    coded = typed["price"].str.extract(r'([\d,]+(?:\.\d+)?)\s*([A-Z]{3})')
+    symbol = typed["price"].str.extract(r'([$€£₹])\s*([\d,]+(?:\.\d+)?)')
+    # string dtype keeps .str usable when no row has a price, e.g. discontinued brands
+    coded, symbol = coded.astype("string"), symbol.astype("string")
+    amount = coded[0].fillna(symbol[1]).str.replace(",", "", regex=False)
+    typed["price_value"] = pd.to_numeric(amount, errors="coerce").astype("float64")
+    typed["price_currency"] = coded[1].fillna(symbol[0].map(CURRENCY_SYMBOLS).astype("string")).astype("category")
+    return typed
+
+def export_typed(dataset:pd.DataFrame, path:str = "OUTPUT/GSMARENA-DATASET.parquet", format:str = "parquet") -> pd.DataFrame:
+    '''
+    Writes the dataset with normalized typed columns (see normalize_dataset) in a columnar format.
+
+    PARAMS
+    -----
+    dataset: pd.DataFrame
+        The raw dataset, e.g. GSMARENAScraper.dataset.
+    path: str
+        Output path. For parquet this is a directory partitioned by manufacturer, replaced
+        as a whole on every export.
+    format: str
+        "parquet" or "feather". Both need pyarrow.
+    '''
+    typed = normalize_dataset(dataset)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    if format == "parquet":
+        # a partitioned write adds files next to existing ones, so build it aside and swap it in
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        shutil.rmtree(temp_path, ignore_errors=True)
+        if typed.empty:
+            # a partitioned write of no rows creates nothing, keep the schema in one plain file
+            os.makedirs(temp_path)
+            typed.to_parquet(os.path.join(temp_path, "empty.parquet"), index=False)
+        else:
+            typed.to_parquet(temp_path, partition_cols=["manufacturer"], index=False)
+        if not os.path.isdir(temp_path):
+            raise RuntimeError(f"parquet export to {temp_path} produced nothing, {path} left as it was")
+        shutil.rmtree(path, ignore_errors=True)
+        os.replace(temp_path, path)
+    elif format == "feather":
+        typed.reset_index(drop=True).to_feather(path)
+    else:
+        raise ValueError("format must be parquet or feather")
+    return typed
+
+def run_gui():
+    '''
+    The tkinter front end. Imported lazily so headless machines can use the CLI without tk.
+    '''
+    import tkinter as tk
+    from tkinter import ttk, messagebox
 
-if __name__ == "__main__":
     def start_scraping():
         # Get values from UI
-        rate_limit = int(rate_limit_entry.get())
+        rate_limit = float(rate_limit_entry.get())
         autosave = autosave_var.get()
         save_interval = int(save_interval_entry.get())
+        backend = backend_combobox.get()
+        workers = int(workers_entry.get())
+        incremental = incremental_var.get()
+        cache_dir = "CACHE" if cache_var.get() else None
         
         try:
             # Disable button during scraping
             start_button.config(state="disabled")
             
             # Create scraper
-            global scraper
-            scraper = GSMARENAScraper(RATE_LIMIT=rate_limit, autosave=autosave, save_interval=save_interval)
+            nonlocal scraper
+            scraper = GSMARENAScraper(RATE_LIMIT=rate_limit, autosave=autosave, save_interval=save_interval, backend=backend,
+                                      workers=workers, incremental=incremental,
+                                      cache_dir=cache_dir)
             
             # Update brand listbox
             update_brand_list()
@@ -281,6 +2070,10 @@ if __name__ == "__main__":
             rate_limit_entry.config(state="disabled")
             autosave_checkbox.config(state="disabled")
             save_interval_entry.config(state="disabled")
+            backend_combobox.config(state="disabled")
+            workers_entry.config(state="disabled")
+            incremental_checkbox.config(state="disabled")
+            cache_checkbox.config(state="disabled")
             
             # Enable brand selection after initialization
             search_entry.config(state="normal")
@@ -333,19 +2126,16 @@ if __name__ == "__main__":
             root.after(0, lambda: status_label.config(text=f"Scraping {brand_name}: {current}/{total} devices"))
         
         def run_scrape():
-            try:
-                # Modify scraper to track progress
-                original_getphonespec = scraper.getphonespec
-                devices_scraped = [0]  # Use list for mutable counter
-                
-                def tracked_getphonespec():
-                    original_getphonespec()
+            devices_scraped = [0]  # Use list for mutable counter
+            
+            def on_event(event, **data):
+                if event == "device":
                     devices_scraped[0] += 1
                     update_progress(devices_scraped[0], total_devices, brand)
-                
-                scraper.getphonespec = tracked_getphonespec
+            
+            scraper.add_listener(on_event)
+            try:
                 scraper.brand_scrape(brand)
-                scraper.getphonespec = original_getphonespec  # Restore original method
                 
                 root.after(0, lambda: progress_bar.grid_remove())
                 root.after(0, lambda: status_label.config(text=f"Finished scraping {brand} ({total_devices} devices)"))
@@ -358,6 +2148,8 @@ if __name__ == "__main__":
                 root.after(0, lambda: status_label.config(text="Error occurred"))
                 root.after(0, lambda: scrape_brand_button.config(state="normal"))
                 root.after(0, lambda: scrape_all_button.config(state="normal"))
+            finally:
+                scraper.remove_listener(on_event)
         
         # Run scraping in a separate thread to prevent UI freeze
         threading.Thread(target=run_scrape, daemon=True).start()
@@ -382,31 +2174,18 @@ if __name__ == "__main__":
             root.after(0, lambda: status_label.config(text=f"Scraping {current_brand} (Brand {brand_index+1}/{total_brands}): {current}/{total} total devices"))
         
         def run_scrape_all():
-            try:
-                total_scraped = [0] 
-                original_getphonespec = scraper.getphonespec
-                
-                def tracked_getphonespec():
-                    original_getphonespec()
+            total_scraped = [0]
+            brand_positions = {brand: i for i, brand in enumerate(scraper.brandINFO["manufacturer"])}
+            
+            def on_event(event, **data):
+                if event == "device":
                     total_scraped[0] += 1
-                
-                scraper.getphonespec = tracked_getphonespec
-                
-                for i, brand in enumerate(scraper.brandINFO["manufacturer"]):
-                    brand_devices = scraper.brandINFO[scraper.brandINFO["manufacturer"] == brand]["total_devices"].values[0]
-                    
-                    # Update progress for each device in this brand
-                    brand_start_count = total_scraped[0]
-                    
-                    def brand_tracked_getphonespec():
-                        original_getphonespec()
-                        total_scraped[0] += 1
-                        update_progress_all(total_scraped[0], total_all_devices, brand, i, len(scraper.brandINFO))
-                    
-                    scraper.getphonespec = brand_tracked_getphonespec
-                    scraper.brand_scrape(brand)
-                
-                scraper.getphonespec = original_getphonespec 
+                    update_progress_all(total_scraped[0], total_all_devices, data["brand"],
+                                        brand_positions[data["brand"]], len(scraper.brandINFO))
+            
+            scraper.add_listener(on_event)
+            try:
+                scraper.scrapeALL()
                 
                 root.after(0, lambda: progress_bar.grid_remove())
                 root.after(0, lambda: status_label.config(text=f"Finished scraping all brands ({total_all_devices} total devices)"))
@@ -419,6 +2198,8 @@ if __name__ == "__main__":
                 root.after(0, lambda: status_label.config(text="Error occurred"))
                 root.after(0, lambda: scrape_brand_button.config(state="normal"))
                 root.after(0, lambda: scrape_all_button.config(state="normal"))
+            finally:
+                scraper.remove_listener(on_event)
         
         # Run scraping in a separate thread to prevent UI freeze
         threading.Thread(target=run_scrape_all, daemon=True).start()
@@ -426,14 +2207,14 @@ if __name__ == "__main__":
     # Create the main window
     root = tk.Tk()
     root.title("GSM Arena Scraper")
-    root.geometry("600x550")
+    root.geometry("600x700")
     
     # Create a frame for settings
     settings_frame = ttk.LabelFrame(root, text="Scraper Settings")
     settings_frame.pack(fill="x", padx=10, pady=10)
     
     # Rate limit
-    ttk.Label(settings_frame, text="Rate Limit (seconds):").grid(row=0, column=0, padx=5, pady=5, sticky="w")
+    ttk.Label(settings_frame, text="Rate Limit (seconds between requests):").grid(row=0, column=0, padx=5, pady=5, sticky="w")
     rate_limit_entry = ttk.Entry(settings_frame, width=10)
     rate_limit_entry.insert(0, "20")
     rate_limit_entry.grid(row=0, column=1, padx=5, pady=5, sticky="w")
@@ -449,9 +2230,31 @@ if __name__ == "__main__":
     save_interval_entry.insert(0, "20")
     save_interval_entry.grid(row=2, column=1, padx=5, pady=5, sticky="w")
     
+    # Fetch backend
+    ttk.Label(settings_frame, text="Fetch Backend:").grid(row=3, column=0, padx=5, pady=5, sticky="w")
+    backend_combobox = ttk.Combobox(settings_frame, values=list(FETCHERS), width=10, state="readonly")
+    backend_combobox.set("http")
+    backend_combobox.grid(row=3, column=1, padx=5, pady=5, sticky="w")
+    
+    # Workers
+    ttk.Label(settings_frame, text="Workers:").grid(row=4, column=0, padx=5, pady=5, sticky="w")
+    workers_entry = ttk.Entry(settings_frame, width=10)
+    workers_entry.insert(0, "1")
+    workers_entry.grid(row=4, column=1, padx=5, pady=5, sticky="w")
+    
+    # Incremental crawl
+    incremental_var = tk.BooleanVar(value=False)
+    incremental_checkbox = ttk.Checkbutton(settings_frame, text="Skip Devices Already Scraped", variable=incremental_var)
+    incremental_checkbox.grid(row=5, column=0, padx=5, pady=5, sticky="w")
+    
+    # Page cache
+    cache_var = tk.BooleanVar(value=False)
+    cache_checkbox = ttk.Checkbutton(settings_frame, text="Cache Pages Locally", variable=cache_var)
+    cache_checkbox.grid(row=6, column=0, padx=5, pady=5, sticky="w")
+    
     # Initialize button
     start_button = ttk.Button(settings_frame, text="Initialize Scraper", command=start_scraping)
-    start_button.grid(row=3, column=0, columnspan=2, padx=5, pady=10)
+    start_button.grid(row=7, column=0, columnspan=2, padx=5, pady=10)
     
     # Progress bar frame
     progress_frame = ttk.Frame(root)
@@ -505,4 +2308,171 @@ if __name__ == "__main__":
     
     scraper = None
     
-    root.mainloop()
\ No newline at end of file
+    root.mainloop()
+
+def run_cli(argv:Optional[List[str]] = None):
+    '''
+    Headless entry point. Run without arguments (or with "gui") to open the tkinter app.
+
+        python src.py scrape --brand Samsung --brand Apple --workers 4 --rate-limit 5
+        python src.py scrape --all --processes 4 --format parquet
+        python src.py scrape --all --resume TEMP/<timestart>/journal.jsonl
+        python src.py scrape --all --low-memory --stream OUTPUT/devices.jsonl --stream OUTPUT/devices.parquet
+        python src.py shard-worker --queue /shared/queue.db
+        python src.py reparse CACHE -o OUTPUT/!GSMARENA-REPARSED.csv
+        python src.py scrape --all --store OUTPUT/gsmarena.db
+        python src.py query "snapdragon 8" --manufacturer Samsung --since 2023
+        python src.py scrape --all --changes OUTPUT/CHANGES.jsonl
+    '''
+    parser = argparse.ArgumentParser(prog="src.py", description="GSM Arena scraper")
+    commands = parser.add_subparsers(dest="command")
+    commands.add_parser("gui", help="open the tkinter app (default)")
+
+    scrape = commands.add_parser("scrape", help="scrape brands headlessly")
+    targets = scrape.add_mutually_exclusive_group(required=True)
+    targets.add_argument("--all", action="store_true", help="every brand")
+    targets.add_argument("--brand", action="append", help="exact brand name, repeatable")
+    targets.add_argument("--search", help="every brand whose name contains this text (case-insensitive)")
+    scrape.add_argument("--processes", type=int, default=1, help="shard brands over this many processes (with --all)")
+    scrape.add_argument("--format", choices=["csv", "parquet", "feather"], default="csv",
+                        help="format of the combined dataset, per-brand CSVs are always written")
+    scrape.add_argument("--resume", help="checkpoint journal of an interrupted run")
+    scrape.add_argument("--resume-queue", action="store_true",
+                        help="with --processes, keep the brands the last sharded run finished")
+    scrape.add_argument("--stream", action="append", default=[],
+                        help="also write rows here as they are scraped (.csv, .jsonl, .db or .parquet), repeatable")
+    scrape.add_argument("--stream-batch", type=int, help="rows per streamed write")
+    scrape.add_argument("--low-memory", action="store_true", help="only hold the current brand in memory")
+    scrape.add_argument("--store", help="upsert rows into this queryable SQLite store, see the query command")
+    scrape.add_argument("--full-specs", help="also keep every spec sheet row here (.parquet or .jsonl.gz)")
+
+    worker = commands.add_parser("shard-worker", help="work a shared brand queue, e.g. on another machine")
+    worker.add_argument("--queue", default="OUTPUT/.queue.db")
+    worker.add_argument("--rate-shares", type=int, default=1,
+                        help="total number of workers on the queue, scales the robots.txt Crawl-delay")
+
+    # settings shared by every command that builds a scraper
+    for command in (scrape, worker):
+        command.add_argument("--rate-limit", type=float, default=20, help="seconds between requests")
+        command.add_argument("--workers", type=int, default=1, help="concurrent device fetches")
+        command.add_argument("--backend", choices=list(FETCHERS), default="http")
+        command.add_argument("--autosave", action="store_true", help="keep a checkpoint journal")
+        command.add_argument("--save-interval", type=int, default=20, help="devices between journal fsyncs")
+        command.add_argument("--incremental", action="store_true", help="skip devices already scraped")
+        command.add_argument("--ttl-days", type=float, default=30)
+        command.add_argument("--cache-dir", help="local page cache directory")
+        command.add_argument("--cache-ttl-days", type=float, default=7)
+        command.add_argument("--metrics-dir", help="write metrics.jsonl and metrics.prom here")
+        command.add_argument("--metrics-interval", type=float, default=60, help="seconds between metric reports")
+        command.add_argument("--adaptive", action="store_true", help="adapt the request rate to how the site responds")
+        command.add_argument("--min-rate-limit", type=float, help="fastest rate limit adaptive mode may reach")
+        command.add_argument("--max-retries", type=int, default=3)
+        command.add_argument("--ignore-robots", action="store_true", help="ignore the robots.txt Crawl-delay")
+        command.add_argument("--changes", help="log added, changed and removed devices to this JSONL file")
+
+    query = commands.add_parser("query", help="look devices up in a store written by scrape --store")
+    query.add_argument("text", nargs="?", help="full-text search over phonename, chipset, cpu and gpu")
+    query.add_argument("--db", default="OUTPUT/gsmarena.db")
+    query.add_argument("--manufacturer")
+    query.add_argument("--chipset", help="case-insensitive, %% wildcards allowed")
+    query.add_argument("--since", help="released in or after YYYY or YYYY-MM")
+    query.add_argument("--until", help="released in or before YYYY or YYYY-MM")
+    query.add_argument("--limit", type=int, default=50)
+    query.add_argument("--json", action="store_true", help="one JSON object per line instead of a table")
+    query.add_argument("--raw", action="store_true", help="treat the text as an FTS5 query (column:term, OR, prefix*)")
+
+    reparser = commands.add_parser("reparse", help="rebuild the dataset from saved pages, offline")
+    reparser.add_argument("source", help="page cache directory, directory of pages or archive")
+    reparser.add_argument("-o", "--output", default="OUTPUT/!GSMARENA-REPARSED.csv")
+    reparser.add_argument("--processes", type=int)
+
+    args = parser.parse_args(argv)
+    if args.command in (None, "gui"):
+        run_gui()
+        return
+    if args.command == "reparse":
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        reparse(args.source, args.processes).to_csv(args.output, index=False)
+        return
+    if args.command == "query":
+        if not os.path.exists(args.db):
+            parser.error(f"no store at {args.db}, create it with scrape --store")
+        store = SpecStore(args.db)
+        try:
+            rows = store.query(args.text, args.manufacturer, args.chipset, args.since, args.until, args.limit, args.raw)
+        except sqlite3.OperationalError as error:
+            parser.error(f"bad query: {error}")
+        finally:
+            store.close()
+        if args.json:
+            for row in rows:
+                print(json.dumps(row))
+        elif rows:
+            print(pd.DataFrame(rows)[["phonename", "releasedate", "chipset", "os", "price"]].to_string(index=False))
+        return
+
+    scraper_kwargs = {"RATE_LIMIT": args.rate_limit, "autosave": args.autosave, "save_interval": args.save_interval,
+                      "backend": args.backend, "workers": args.workers, "incremental": args.incremental,
+                      "ttl_days": args.ttl_days, "cache_dir": args.cache_dir, "cache_ttl_days": args.cache_ttl_days,
+                      "metrics_dir": args.metrics_dir, "metrics_interval": args.metrics_interval,
+                      "adaptive": args.adaptive, "min_rate_limit": args.min_rate_limit, "max_retries": args.max_retries,
+                      "respect_robots": not args.ignore_robots, "changelog": args.changes}
+    if args.command == "shard-worker":
+        GSMARENAScraper(**scraper_kwargs, rate_shares=args.rate_shares).scrape_shard(args.queue)
+        return
+
+    def report(event, **data):
+        if event == "brand_done":
+            print(f"Finished {data['brand']}: {data['rows']} devices")
+
+    if args.all and args.processes > 1:
+        ignored = [option for option, given in (("--resume", args.resume), ("--low-memory", args.low_memory),
+                                                ("--autosave", args.autosave)) if given]
+        if ignored:
+            parser.error(f"{', '.join(ignored)} cannot be used with --processes, use --resume-queue to continue a sharded crawl")
+        if args.stream or args.store or args.full_specs:
+            parser.error("--stream, --store and --full-specs need a single process, shards already write OUTPUT/<brand>.csv")
+        try:
+            dataset = scrape_sharded(args.processes, resume=args.resume_queue, **scraper_kwargs)
+        except RuntimeError as error:
+            parser.exit(1, f"error: {error}\n")
+    else:
+        if args.processes > 1:
+            parser.error("--processes only shards --all")
+        if args.resume_queue:
+            parser.error("--resume-queue needs --all --processes N")
+        if args.low_memory and args.format != "csv":
+            parser.error("--low-memory keeps no dataset to export, use --stream with a .parquet file instead")
+        # a resumed crawl continues its streams, a new one starts them over
+        sinks = [open_sink(path, args.stream_batch, append=bool(args.resume)) for path in args.stream]
+        if args.store:
+            sinks.append(SpecStore(args.store))
+        spec_sheets = None
+        if args.full_specs:
+            # incremental runs skip fresh devices, so their earlier sheets have to stay
+            spec_sheets = SpecSheetWriter(args.full_specs, append=bool(args.resume) or args.incremental)
+        scraper = GSMARENAScraper(**scraper_kwargs, sinks=sinks, keep_records=not args.low_memory, spec_sheets=spec_sheets)
+        scraper.add_listener(report)
+        if args.resume:
+            scraper.resume(args.resume)
+        if args.all:
+            scraper.scrapeALL()
+        else:
+            manufacturers = list(scraper.brandINFO["manufacturer"])
+            if args.search:
+                brands = [brand for brand in manufacturers if args.search.lower() in brand.lower()]
+            else:
+                unknown = [brand for brand in args.brand if brand not in manufacturers]
+                if unknown:
+                    parser.error(f"unknown brand(s): {', '.join(unknown)}")
+                brands = args.brand
+            for brand in brands:
+                scraper.brand_scrape(brand)
+            scraper.close()
+        dataset = scraper.dataset
+
+    if args.format != "csv":
+        export_typed(dataset, f"OUTPUT/GSMARENA-DATASET.{args.format}", args.format)
+
+if __name__ == "__main__":
+    run_cli()
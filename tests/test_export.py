@@ -0,0 +1,49 @@
+'''
+normalize_dataset and export_typed on awkward datasets.
+
+    python -m pytest tests
+'''
+import os
+import sys
+import warnings
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src import COLUMNS, export_typed, normalize_dataset
+
+
+def dataset(prices, manufacturers=None) -> pd.DataFrame:
+    rows = pd.DataFrame([{column: "Na" for column in COLUMNS} for _ in prices])
+    rows["price"] = prices
+    rows["manufacturer"] = manufacturers or ["Nokia"] * len(prices)
+    return rows
+
+
+def test_dataset_without_prices():
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", FutureWarning)
+        typed = normalize_dataset(dataset(["Na", "Na", "Na"]))
+    assert typed["price_value"].isna().all()
+    assert typed["price_value"].dtype == "float64"
+
+
+def test_prices_in_both_notations():
+    typed = normalize_dataset(dataset(["310 EUR", "$ 299.99 / € 279.00", "Na"]))
+    assert typed["price_value"].tolist()[:2] == [310.0, 299.99]
+    assert typed["price_currency"].tolist()[:2] == ["EUR", "USD"]
+
+
+def test_parquet_reexport_replaces_previous(tmp_path):
+    path = str(tmp_path / "dataset.parquet")
+    rows = dataset(["310 EUR", "Na", "Na"], ["Nokia", "Apple", "Nokia"])
+    export_typed(rows, path)
+    export_typed(rows, path)
+    assert len(pd.read_parquet(path)) == 3
+
+
+def test_empty_parquet_export(tmp_path):
+    path = str(tmp_path / "dataset.parquet")
+    export_typed(dataset(["310 EUR"]), path)
+    export_typed(pd.DataFrame(columns=COLUMNS), path)
+    assert len(pd.read_parquet(path)) == 0
@@ -0,0 +1,129 @@
+'''
+Retry, backoff and AIMD behaviour of GSMARENAScraper.fetch_with_retries against a local stub
+server that answers with scripted status codes.
+
+    python -m pytest tests
+'''
+import http.server
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import src
+from src import AdaptiveRateLimiter, FetchError, GSMARENAScraper
+
+
+class StubHandler(http.server.BaseHTTPRequestHandler):
+    # (status, headers) answered in order, the last one repeats
+    script = []
+    requests = []
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        StubHandler.requests.append((self.path, time.monotonic()))
+        if self.path == "/robots.txt":
+            self.send_response(404)
+            self.end_headers()
+            return
+        status, headers = self.script[min(len(self.requests) - 1, len(self.script) - 1)]
+        body = b"<html><body>ok</body></html>"
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def stub(monkeypatch, tmp_path):
+    '''
+    Starts the stub server and returns a function that sets its script and gives the page URL.
+    Runs in an empty directory so no OUTPUT/ state of a real crawl is picked up.
+    '''
+    monkeypatch.chdir(tmp_path)
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    def serve(*script):
+        StubHandler.script = list(script)
+        StubHandler.requests = []
+        return f"http://127.0.0.1:{server.server_address[1]}/page.php"
+
+    monkeypatch.setattr(src, "MAKERS_URL", f"http://127.0.0.1:{server.server_address[1]}/makers.php3")
+    yield serve
+    server.shutdown()
+    server.server_close()
+
+
+def scraper(**kwargs) -> GSMARENAScraper:
+    settings = {"RATE_LIMIT": 0, "brand_cache": None, "respect_robots": False}
+    settings.update(kwargs)
+    return GSMARENAScraper(**settings)
+
+
+def test_retry_after_is_honoured(stub):
+    url = stub((429, {"Retry-After": "1"}), (200, {}))
+    crawler = scraper(max_retries=3)
+    start = time.monotonic()
+    assert "ok" in crawler.fetch_with_retries(url)
+    assert len(StubHandler.requests) == 2
+    assert time.monotonic() - start >= 0.9
+    assert crawler.metrics.counters["retries"] == 1
+
+
+def test_retries_are_bounded_with_exponential_backoff(stub):
+    url = stub((503, {}))
+    crawler = scraper(max_retries=2)
+    with pytest.raises(FetchError) as error:
+        crawler.fetch_with_retries(url)
+    assert error.value.status == 503
+    # the first try and two retries, 1 s then 2 s apart
+    times = [at for _, at in StubHandler.requests]
+    assert len(times) == 3
+    assert times[1] - times[0] >= 0.9
+    assert times[2] - times[1] >= 1.9
+    assert crawler.metrics.counters["retries"] == 2
+
+
+def test_client_errors_are_not_retried(stub):
+    url = stub((404, {}))
+    crawler = scraper(max_retries=3)
+    with pytest.raises(FetchError) as error:
+        crawler.fetch_with_retries(url)
+    assert error.value.status == 404
+    assert len(StubHandler.requests) == 1
+
+
+def test_adaptive_rate_speeds_up_while_healthy(stub):
+    url = stub((200, {}))
+    crawler = scraper(RATE_LIMIT=0.2, adaptive=True, min_rate_limit=0.05)
+    for _ in range(5):
+        crawler.fetch_with_retries(url)
+    assert isinstance(crawler.limiter, AdaptiveRateLimiter)
+    assert crawler.limiter.interval < 0.2
+    assert crawler.limiter.interval >= 0.05
+
+
+def test_adaptive_rate_backs_off_when_throttled(stub):
+    url = stub((429, {"Retry-After": "1"}), (200, {}))
+    crawler = scraper(RATE_LIMIT=0.2, adaptive=True, min_rate_limit=0.05)
+    crawler.fetch_with_retries(url)
+    assert crawler.limiter.interval > 0.2
+
+
+def test_latency_step_becomes_the_new_baseline():
+    limiter = AdaptiveRateLimiter(2.0, 1.0)
+    for _ in range(20):
+        limiter.success(0.1)
+    for _ in range(200):
+        limiter.last_decrease = 0.0  # let every spike count
+        limiter.success(0.5)
+    assert limiter.interval < limiter.max_interval
+    assert limiter.latency == pytest.approx(0.5)
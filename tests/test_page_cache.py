@@ -0,0 +1,41 @@
+'''
+PageCache bookkeeping: content-addressed blobs, size accounting and LRU eviction.
+
+    python -m pytest tests
+'''
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src import PageCache
+
+
+def blobs(directory) -> list:
+    return [name for _, _, names in os.walk(directory) for name in names if name.endswith(".html.gz")]
+
+
+def test_changed_page_releases_its_old_blob(tmp_path):
+    cache = PageCache(str(tmp_path), max_size_mb=1)
+    for version in range(50):
+        # random-looking pages so they do not compress away
+        cache.store("https://example.com/phone.php", os.urandom(20000).hex())
+    assert len(blobs(tmp_path)) == 1
+    assert cache.fresh("https://example.com/phone.php") is not None
+    assert PageCache(str(tmp_path)).size == cache.size
+
+
+def test_shared_blob_stays_while_another_url_uses_it(tmp_path):
+    cache = PageCache(str(tmp_path))
+    cache.store("https://example.com/a.php", "<html>same</html>")
+    cache.store("https://example.com/b.php", "<html>same</html>")
+    cache.store("https://example.com/a.php", "<html>new</html>")
+    assert cache.fresh("https://example.com/b.php") == "<html>same</html>"
+    assert len(blobs(tmp_path)) == 2
+
+
+def test_eviction_keeps_the_page_just_stored(tmp_path):
+    cache = PageCache(str(tmp_path), max_size_mb=1)
+    for number in range(30):
+        cache.store(f"https://example.com/{number}.php", os.urandom(20000).hex())
+    assert cache.size <= 1024 * 1024
+    assert cache.fresh("https://example.com/29.php") is not None
@@ -0,0 +1,60 @@
+'''
+SpecStore upserts and lookups.
+
+    python -m pytest tests
+'''
+import os
+import sqlite3
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src import SpecStore
+
+DEVICES = [("https://example.com/s24.php", "Samsung", "Galaxy S24+", "Exynos 2400 (4 nm)", "2024, January"),
+           ("https://example.com/pixel.php", "Google", "Pixel 8 Pro (2023)", "Google Tensor G3", "2023, October"),
+           ("https://example.com/xperia.php", "Sony", "Xperia 1 IV", "SM8450-AC Snapdragon 8+ Gen 1", "2022, May")]
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SpecStore(str(tmp_path / "store.db"))
+    for url, manufacturer, phonename, chipset, releasedate in DEVICES:
+        store.write(url, {"manufacturer": manufacturer, "phonename": phonename, "chipset": chipset,
+                          "releasedate": releasedate})
+    yield store
+    store.close()
+
+
+@pytest.mark.parametrize("text, phonename", [("Galaxy S24+", "Galaxy S24+"),
+                                             ("SM8450-AC", "Xperia 1 IV"),
+                                             ("Pixel 8 Pro (2023)", "Pixel 8 Pro (2023)"),
+                                             ("Snapdragon 8+ Gen 1", "Xperia 1 IV"),
+                                             ('say "hi', None)])
+def test_plain_text_never_raises(store, text, phonename):
+    rows = store.query(text)
+    assert [row["phonename"] for row in rows] == ([phonename] if phonename else [])
+
+
+def test_raw_query_syntax(store):
+    assert [row["phonename"] for row in store.query("phonename:pix*", raw=True)] == ["Pixel 8 Pro (2023)"]
+    with pytest.raises(sqlite3.OperationalError):
+        store.query("phonename:(", raw=True)
+
+
+def test_filters_and_release_range(store):
+    assert [row["phonename"] for row in store.query(released_from="2023", released_to="2023")] == ["Pixel 8 Pro (2023)"]
+    assert [row["phonename"] for row in store.query(manufacturer="Sony", chipset="%snapdragon%")] == ["Xperia 1 IV"]
+
+
+def test_upsert_keeps_one_row_per_url(store):
+    store.write(DEVICES[0][0], {"manufacturer": "Samsung", "phonename": "Galaxy S24+", "chipset": "Snapdragon 8 Gen 3"})
+    assert len(store) == 3
+    assert store.get(DEVICES[0][0])["chipset"] == "Snapdragon 8 Gen 3"
+    assert [row["phonename"] for row in store.query("Exynos")] == []
+
+
+def test_rows_without_url_are_not_stored(store):
+    store.write(None, {"manufacturer": "Nokia", "phonename": "3310"})
+    assert len(store) == 3